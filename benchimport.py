@@ -0,0 +1,47 @@
+"""
+Measure the start-up cost of benfordspy: the time to import it and run a
+list-only analysis in a fresh interpreter, and the modules that loads beyond
+numpy.
+"""
+
+import subprocess
+import sys
+
+script = """
+import sys
+import time
+
+t0 = time.perf_counter()
+import numpy
+t1 = time.perf_counter()
+before = set(sys.modules)
+
+import benfordspy.BenfordsPy as BP
+t2 = time.perf_counter()
+BP.BenfordsPy().analyzelist([1, 2, 2, 3, 5, 8, 13, 21, 34, 55], "KS")
+t3 = time.perf_counter()
+
+loaded = sorted(set(sys.modules) - before)
+print(t1 - t0, t2 - t1, t3 - t2)
+print(" ".join(loaded))
+"""
+
+runs = 5
+times = []
+for run in range(runs):
+    output = subprocess.run([sys.executable, "-c", script],
+                            capture_output=True,
+                            text=True,
+                            check=True
+                            ).stdout.splitlines()
+    times += [[float(t) for t in output[0].split()]]
+    loaded = output[1].split()
+
+best = [min(t[k] for t in times) for k in range(3)]
+
+print("Time to import numpy is {:.4f} seconds".format(best[0]))
+print("Time to import benfordspy.BenfordsPy is {:.4f} seconds".format(best[1]))
+print("Time to analyzelist is {:.4f} seconds".format(best[2]))
+print("Modules loaded beyond numpy: {}".format(len(loaded)))
+print("Packages loaded beyond numpy: {}".format(
+    ", ".join(sorted({name.split('.')[0] for name in loaded}))))
@@ -2,16 +2,46 @@
 Run Benford's Law analysis of data.
 """
 
-from benfordspy.excel import ExcelDB
-from benfordspy.csv import CSVDB
+import os
+
+import numpy as np
+
 import benfordspy.numerics as numerics
 import benfordspy.dataset as dataset
 
+# Sources (openpyxl, pandas, pyarrow) and plotting (matplotlib) are imported
+# on first use, so that e.g. analyzelist loads nothing beyond numpy.
+
+
+def __getattr__(name):
+    if name == "ExcelDB":
+        from benfordspy.excel import ExcelDB
+        return ExcelDB
+    if name == "CSVDB":
+        from benfordspy.csv import CSVDB
+        return CSVDB
+    raise AttributeError("module {!r} has no attribute {!r}"
+                         .format(__name__, name))
+
 
 class BenfordsPy:
 
-    def __init__(self):
+    """
+    Run analyses and hold the result of the last one. Filters are passed to
+    each source as an immutable filter specification, so instances can run
+    in separate threads at the same time.
+
+    :param cache: Optional dict-like object, which may be shared between
+    instances, to keep the first digit counts of sources keyed by file,
+    modification time, size and filter specification.
+    """
+
+    def __init__(self, cache=None):
+        self.cache = cache
         self.result = 0
+        self.duplicates = []
+        self.repeatrates = {}
+        self.drilldown = None
 
     def dotest(self,
                data,
@@ -60,6 +90,84 @@ class BenfordsPy:
                                     printsignificance
                                     )
 
+    def analyzeframe(self,
+                     data,
+                     testtype,
+                     column=None,
+                     groupby=None,
+                     plottest=False,
+                     printsignificance=False
+                     ):
+        """
+        Analyze data from pandas or Apache Arrow without copying it to a
+        list, reading the underlying buffers. Nulls are left out.
+
+        :param data: pandas Series or DataFrame, or pyarrow Array,
+        ChunkedArray or Table.
+        :param testtype: Test of significance to apply.
+        :param column: Name of the column of a DataFrame or Table to analyze;
+        may be left out for a single column without groupby.
+        :param groupby: Name or list of names of key columns of a DataFrame
+        or Table; if given, the result is a results.ResultTable of every test
+        value of each group, and testtype is not used. Default is None.
+        :param plottest: Flag to plot results, without groupby; default value
+        is False.
+        :param printsignificance: Flag to output significance test results,
+        without groupby; default is False.
+
+        :return: Nothing.
+        """
+
+        import benfordspy.frames as frames
+        from benfordspy.results import ResultTable
+
+        if groupby is None:
+            counts = frames.framecounts(data, column)
+            if np.sum(counts[1:]) == 0:
+                raise IOError("Loaded no data, quitting")
+
+            self.result = numerics.histogramtest(testtype,
+                                                 counts,
+                                                 plottest,
+                                                 printsignificance
+                                                 )
+            return
+
+        counts, keys = frames.framecounts(data, column, groupby)
+
+        self.result = ResultTable.fromcounts(counts, keys)
+
+    def sourcecounts(self, filename, spec, extract, mode=None):
+        """
+        Return the first digit counts of a file under a filter specification,
+        from self.cache if present there.
+
+        :param filename: Source file.
+        :param spec: Hashable filter specification, see filters.
+        :param extract: Function with no arguments returning the counts.
+        :param mode: Hashable name of the way the counts are extracted, e.g.
+        "parallel", kept apart in the cache; default is None.
+
+        :return: Numpy array of the counts of first digits 0-9.
+        """
+
+        if self.cache is None:
+            return extract()
+
+        stat = os.stat(filename)
+        key = (os.path.abspath(filename),
+               stat.st_mtime_ns,
+               stat.st_size,
+               spec,
+               mode)
+
+        counts = self.cache.get(key)
+        if counts is None:
+            counts = extract()
+            self.cache[key] = counts
+
+        return counts.copy()
+
     def analyzeexcel(self,
                      filename,
                      testtype,
@@ -72,7 +180,9 @@ class BenfordsPy:
                      collblincldefault=False,
                      celrngincl=None,
                      celrngexcl=None,
-                     celrngincldefault=False,
+                     celrngincldefault=True,
+                     sheethistograms=None,
+                     drilldown=False,
                      plottest=False,
                      printsignificance=False
                      ):
@@ -90,10 +200,16 @@ class BenfordsPy:
         :param collblexcl: Set of column labels to exclude.
         :param collblincldefault: Flag to include column by default; default
         value is False.
-        :param celrngincl: Set of cell ranges to include.
+        :param celrngincl: Set of cell ranges to include, e.g. {"F2:F500000"}.
         :param celrngexcl: Set of cell ranges to exclude.
         :param celrngincldefault: Flag to include cell ranges by default;
         default value is True.
+        :param sheethistograms: excel.SheetHistograms holding the counts of
+        each worksheet from earlier analyses, so that only worksheets changed
+        since are read again; default is None.
+        :param drilldown: Flag to keep the source cell of every number in
+        self.drilldown, a drilldown.DrillDown, to look up the records by
+        leading digits; default is False. Sources are then always read.
         :param plottest: Flag to plot results; default value is False.
         :param printsignificance: Flag to output significance test results;
         default is False.
@@ -101,42 +217,52 @@ class BenfordsPy:
         :return: Nothing.
         """
 
-        db = ExcelDB(filename)
-        data = dataset.dataset()
-
-        if wkshtincl and isinstance(wkshtincl, set):
-            db.Filter.WorkSheets.include = wkshtincl
-
-        if rowlblincl and isinstance(rowlblincl, set):
-            db.Filter.RowLabels.include = rowlblincl
-        if rowlblexcl and isinstance(rowlblexcl, set):
-            db.Filter.RowLabels.exclude = rowlblexcl
-        db.Filter.RowLabels.defaultinclude = rowlblincldefault
-
-        if collblincl and isinstance(collblincl, set):
-            db.Filter.ColLabels.include = collblincl
-        if collblexcl and isinstance(collblexcl, set):
-            db.Filter.ColLabels.exclude = collblexcl
-        db.Filter.ColLabels.defaultinclude = collblincldefault
-
-        if celrngincl and isinstance(collblincl, set):
-            db.Filter.CellRange.include = celrngincl
-        if celrngexcl and isinstance(celrngexcl, set):
-            db.Filter.CellRange.exclude = celrngexcl
-        db.Filter.CellRange.defaultinclude = celrngincldefault
-
-        exceldata = db.extractnumbers()
-        data.datainit(exceldata)
-        if data.data.size == 0:
+        from benfordspy.excel import ExcelDB
+        from benfordspy.filters import ExcelFilter, Rule
+        from benfordspy.drilldown import DrillDown
+
+        spec = ExcelFilter(WorkSheets=Rule(wkshtincl),
+                           RowLabels=Rule(rowlblincl,
+                                          rowlblexcl,
+                                          rowlblincldefault),
+                           ColLabels=Rule(collblincl,
+                                          collblexcl,
+                                          collblincldefault),
+                           CellRange=Rule(celrngincl,
+                                          celrngexcl,
+                                          celrngincldefault)
+                           )
+
+        def extract():
+            if drilldown:
+                db = ExcelDB(filename)
+                numbers, coordinates = db.extractnumbers(spec, True)
+                self.drilldown = DrillDown(numbers, coordinates,
+                                           sheets=db.wslist)
+
+                return numerics.digitcounts(self.drilldown.firstdigits)
+
+            if sheethistograms is not None:
+                return sheethistograms.counts(filename, spec)
+
+            data = dataset.dataset()
+            data.datainit(ExcelDB(filename).extractnumbers(spec))
+            data.updatefirstdigits()
+
+            return numerics.digitcounts(data.firstdigits)
+
+        if drilldown:
+            counts = extract()
+        else:
+            counts = self.sourcecounts(filename, spec, extract)
+        if np.sum(counts[1:]) == 0:
             raise IOError("Loaded no data, quitting")
 
-        data.updatefirstdigits()
-
-        self.result = numerics.test(testtype,
-                                    data.firstdigits,
-                                    plottest,
-                                    printsignificance
-                                    )
+        self.result = numerics.histogramtest(testtype,
+                                             counts,
+                                             plottest,
+                                             printsignificance
+                                             )
 
     def analyzeCSV(self,
                    filename,
@@ -153,13 +279,15 @@ class BenfordsPy:
                    colnumincl=None,
                    colnumexcl=None,
                    colnumincldefault=False,
+                   processes=None,
+                   drilldown=False,
                    plottest=False,
                    printsignificance=False
                    ):
         """
-        Analyze data from Excel file.
+        Analyze data from CSV file.
 
-        :param filename: Excel file.
+        :param filename: CSV file.
         :param testtype: Test of significance to apply.
         :param rowlblincl: Set of row labels to include.
         :param rowlblexcl: Set of row labels to exclude.
@@ -177,6 +305,14 @@ class BenfordsPy:
         :param colnumexcl: Set of column numbers  to exclude.
         :param colnumincldefault: Flag to include column numbers by default;
         default value is False.
+        :param processes: Number of processes to parse the file with in
+        parallel byte ranges, see csv.parallelcounts; default is None, which
+        loads the file in this process. Column labels cannot be filtered in
+        parallel.
+        :param drilldown: Flag to keep the source row and column of every
+        number in self.drilldown, a drilldown.DrillDown, to look up the
+        records by leading digits; default is False. Not available with
+        processes. Sources are then always read.
         :param plottest: Flag to plot results; default value is False.
         :param printsignificance: Flag to output significance test results;
         default is False.
@@ -184,43 +320,152 @@ class BenfordsPy:
         :return: Nothing.
         """
 
-        db = CSVDB(filename)
-        data = dataset.dataset()
-
-        if rowlblincl and isinstance(rowlblincl, set):
-            db.Filter.RowLabels.include = rowlblincl
-        if rowlblexcl and isinstance(rowlblexcl, set):
-            db.Filter.RowLabels.exclude = rowlblexcl
-        db.Filter.RowLabels.defaultinclude = rowlblincldefault
-
-        if collblincl and isinstance(collblincl, set):
-            db.Filter.ColLabels.include = collblincl
-        if collblexcl and isinstance(collblexcl, set):
-            db.Filter.ColLabels.exclude = collblexcl
-        db.Filter.ColLabels.defaultinclude = collblincldefault
-
-        if rownumincl and isinstance(rownumincl, set):
-            db.Filter.RowNumbers.include = rownumincl
-        if rownumexcl and isinstance(rownumexcl, set):
-            db.Filter.RowNumbers.exclude = rownumexcl
-        db.Filter.RowNumbers.defaultinclude = rownumincldefault
-
-        if colnumincl and isinstance(colnumincl, set):
-            db.Filter.ColNumbers.include = colnumincl
-        if colnumexcl and isinstance(colnumexcl, set):
-            db.Filter.ColNumbers.exclude = colnumexcl
-        db.Filter.ColNumbers.defaultinclude = colnumincldefault
-
-        CSVdata = db.extractnumbers()
-
-        data.datainit(CSVdata)
-        if data.data.size == 0:
+        import benfordspy.csv as csv
+        from benfordspy.csv import CSVDB
+        from benfordspy.filters import CSVFilter, Rule
+        from benfordspy.drilldown import DrillDown
+
+        spec = CSVFilter(RowLabels=Rule(rowlblincl,
+                                        rowlblexcl,
+                                        rowlblincldefault),
+                         ColLabels=Rule(collblincl,
+                                        collblexcl,
+                                        collblincldefault),
+                         RowNumbers=Rule(rownumincl,
+                                         rownumexcl,
+                                         rownumincldefault),
+                         ColNumbers=Rule(colnumincl,
+                                         colnumexcl,
+                                         colnumincldefault)
+                         )
+
+        def extract():
+            if drilldown:
+                numbers, coordinates = CSVDB(filename).extractnumbers(spec,
+                                                                      True)
+                self.drilldown = DrillDown(numbers, coordinates)
+
+                return numerics.digitcounts(self.drilldown.firstdigits)
+
+            if processes is not None:
+                return csv.parallelcounts(filename, processes, spec)
+
+            data = dataset.dataset()
+            data.datainit(CSVDB(filename).extractnumbers(spec))
+            data.updatefirstdigits()
+
+            return numerics.digitcounts(data.firstdigits)
+
+        if drilldown and processes is not None:
+            raise ValueError("Drill-down is not available with processes.")
+
+        if drilldown:
+            counts = extract()
+        else:
+            counts = self.sourcecounts(filename,
+                                       spec,
+                                       extract,
+                                       "parallel" if processes else None)
+        if np.sum(counts[1:]) == 0:
             raise IOError("Loaded no data, quitting")
 
-        data.updatefirstdigits()
+        self.result = numerics.histogramtest(testtype,
+                                             counts,
+                                             plottest,
+                                             printsignificance
+                                             )
+
+    def analyzetext(self,
+                    filename,
+                    testtype,
+                    thousands=None,
+                    plottest=False,
+                    printsignificance=False
+                    ):
+        """
+        Analyze every number written in a text file such as a CSV or JSON
+        export. First digits are read straight from the characters of each
+        number, so they are exact and no float conversion is done. Zeros are
+        left out, as for the other sources.
+
+        :param filename: Text file.
+        :param testtype: Test of significance to apply.
+        :param thousands: Byte string used as thousands separator, e.g. b',';
+        default is None.
+        :param plottest: Flag to plot results; default value is False.
+        :param printsignificance: Flag to output significance test results;
+        default is False.
+
+        :return: Nothing.
+        """
+
+        import benfordspy.textdigits as textdigits
+
+        firstdigits = textdigits.scanfile(filename, thousands)[0]
+        firstdigits = firstdigits[firstdigits > 0]
+        if firstdigits.size == 0:
+            raise IOError("Loaded no data, quitting")
 
         self.result = numerics.test(testtype,
-                                    data.firstdigits,
+                                    firstdigits,
                                     plottest,
                                     printsignificance
                                     )
+
+    def analyzeduplicates(self,
+                          input,
+                          k=10,
+                          groups=None,
+                          capacity=None,
+                          printduplicates=False
+                          ):
+        """
+        Run the number duplication test, finding the most frequently repeated
+        values of the input. Results are stored in self.duplicates and, if
+        groups are given, self.repeatrates.
+
+        :param input: 1-D list or numpy array of numbers, or any iterable of
+        batches of numbers, e.g. a generator reading a feed.
+        :param k: Number of repeated values to find.
+        :param groups: 1-D list or numpy array of group keys, one per number,
+        to calculate the repeat rate of each group; default is None.
+        :param capacity: Number of counters for approximate counting in
+        bounded memory; default is None, which counts exactly.
+        :param printduplicates: Flag to output the repeated values; default
+        is False.
+
+        :return: Nothing.
+        """
+
+        import benfordspy.duplication as duplication
+
+        if capacity is None:
+            if not (isinstance(input, np.ndarray) or
+                    (isinstance(input, list) and
+                     all(np.isscalar(value) for value in input))):
+                # Batches are joined, as exact counting holds every value.
+                input = [value for batch in input for value in np.ravel(batch)]
+
+            data = dataset.dataset()
+            if data.datainit(np.asarray(input, dtype=float).tolist()) == 0:
+                raise TypeError("Input to analyzeduplicates is not 1-D.")
+            self.duplicates = data.duplicates(k)
+
+            if groups is not None:
+                self.repeatrates = duplication.repeatrates(data.data, groups)
+
+        else:
+            if groups is not None:
+                raise ValueError("Repeat rates by group need exact counting.")
+
+            counter = duplication.SpaceSaving(capacity)
+            for batch in input:
+                counter.update(batch)
+            self.duplicates = [(value, count)
+                               for value, count, error in counter.top(k)]
+
+        if printduplicates is True:
+            print("Value         Count")
+            print("-----         -----")
+            for value, count in self.duplicates:
+                print("{:<12}  {}".format(value, count))
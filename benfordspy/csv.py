@@ -2,18 +2,35 @@
 This class accesses data from CSV files.
 """
 
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+
 import numpy as np
 
+import benfordspy.numerics as numerics
+import benfordspy.textdigits as textdigits
+from benfordspy.filters import CSVFilter
+
+
+# Start of a line holding data, i.e. neither blank nor a comment.
+_DATALINE = re.compile(rb'^[^\S\n]*[^#\s]', re.MULTILINE)
+
+# Comment, from # to the end of the line.
+_COMMENT = re.compile(rb'#[^\n]*')
+
 
 class CSVDB:
 
     def __init__(self, file):
+        self.file = file
         self.CSV_data = np.genfromtxt(file, delimiter=',')
 
     class Filter:
         """
-        This class holds the filters applied to the CSV data to determine
-        the numbers that will be passed on for the Benford Law's test.
+        This class holds the default filters applied to the CSV data to
+        determine the numbers that will be passed on for the Benford Law's
+        test.
         There are three parameters: row labels, column labels, worksheets, and
         cell range.
         Note that a parameter is used if it is in the include list and not used
@@ -24,6 +41,11 @@ class CSVDB:
         Row and column labels are strings, and are applied to any cell within
         the row or column.
         All matches are exact, including string case.
+        Row numbers start at 0 and count the rows of data: blank lines and
+        comment lines (starting with #) are not rows.
+        Filters passed to extractnumbers as a filters.CSVFilter take
+        precedence over these class attributes, which are shared by every
+        CSVDB.
         """
 
         class RowLabels:
@@ -52,33 +74,46 @@ class CSVDB:
 
             defaultinclude = False
 
-    def extractnumbers(self):
+    def extractnumbers(self, spec=None, coordinates=False):
         """
-        Apply the filters set in the Filter class and return the set of all
+        Apply the filters of a filter specification and return the set of all
         numbers from the CSV file.
 
-        :return: List of numbers from CSV file subject to Filter.
+        :param spec: filters.CSVFilter to apply; default is None, which uses
+        the class attributes of the Filter class.
+        :param coordinates: Flag to also return the source row and column of
+        each number; default is False.
+
+        :return: List of numbers from CSV file subject to Filter. If
+        coordinates is True, a tuple of that list and a dictionary of 1-D
+        numpy int32 arrays, parallel to the list, of "row" and "col"
+        (0-based, as for the row and column number filters, so rows do not
+        count blank and comment lines) and "line", the 1-based line of the
+        file.
         """
 
+        if spec is None:
+            spec = CSVFilter.fromclass(self.Filter)
+
         datareturn = []
 
         # Filter rows
         rows = []
         for row_idx, row_entry in enumerate(self.CSV_data):
             ifincl = any(
-                         (set(row_entry) & self.Filter.RowLabels.include)
+                         (set(row_entry) & spec.RowLabels.include)
                          |
-                         ({row_idx} & self.Filter.RowNumbers.include)
+                         ({row_idx} & spec.RowNumbers.include)
                          )
             ifexcl = any(
-                         (set(row_entry) & self.Filter.RowLabels.exclude)
+                         (set(row_entry) & spec.RowLabels.exclude)
                          |
-                         ({row_idx} & self.Filter.RowNumbers.exclude)
+                         ({row_idx} & spec.RowNumbers.exclude)
                          )
             ifdefault = (
-                         self.Filter.RowLabels.defaultinclude
+                         spec.RowLabels.defaultinclude
                          |
-                         self.Filter.RowNumbers.defaultinclude
+                         spec.RowNumbers.defaultinclude
                          )
 
             if ifexcl is False and any((ifincl, ifdefault)):
@@ -89,19 +124,19 @@ class CSVDB:
         columns = []
         for col_idx, col_entry in enumerate(CSV_data_transpose):
             ifincl = any(
-                         (set(col_entry) & self.Filter.ColLabels.include)
+                         (set(col_entry) & spec.ColLabels.include)
                          |
-                         ({col_idx} & self.Filter.ColNumbers.include)
+                         ({col_idx} & spec.ColNumbers.include)
                          )
             ifexcl = any(
-                         (set(col_entry) & self.Filter.ColLabels.exclude)
+                         (set(col_entry) & spec.ColLabels.exclude)
                          |
-                         ({col_idx} & self.Filter.ColNumbers.exclude)
+                         ({col_idx} & spec.ColNumbers.exclude)
                          )
             ifdefault = (
-                         self.Filter.ColLabels.defaultinclude
+                         spec.ColLabels.defaultinclude
                          |
-                         self.Filter.ColNumbers.defaultinclude
+                         spec.ColNumbers.defaultinclude
                          )
 
             if ifexcl is False and any((ifincl, ifdefault)):
@@ -132,4 +167,285 @@ class CSVDB:
 
         datareturn = CSV_data_numbers
 
+        if coordinates:
+            cellrows, cellcols = np.nonzero(np.logical_and(
+                mask, ~np.isnan(self.CSV_data)))
+            return datareturn, {"row": cellrows.astype(np.int32),
+                                "col": cellcols.astype(np.int32),
+                                "line": datalines(self.file)[cellrows]}
+
         return datareturn
+
+
+def datalines(file):
+    """
+    Find the line of the file holding each data row, leaving out blank and
+    comment lines as numpy.genfromtxt does.
+
+    :param file: Name of the CSV file.
+
+    :return: 1-D numpy int32 array of the 1-based line of each row.
+    """
+
+    with open(file, 'rb') as fh:
+        content = fh.read()
+
+    starts = np.array([match.start() for match in _DATALINE.finditer(content)],
+                      dtype=np.int64)
+    newlines = np.flatnonzero(np.frombuffer(content, dtype=np.uint8) == 10)
+
+    return (np.searchsorted(newlines, starts) + 1).astype(np.int32)
+
+
+def byteranges(file, parts):
+    """
+    Split a file into byte ranges that start and end at line boundaries.
+
+    :param file: Name of the file.
+    :param parts: Number of ranges to aim for; fewer are returned for short
+    files.
+
+    :return: List of (start, end) byte offsets.
+    """
+
+    size = os.path.getsize(file)
+    offsets = [0]
+
+    with open(file, 'rb') as fh:
+        for part in range(1, parts):
+            target = size * part // parts
+            if target <= offsets[-1]:
+                continue
+
+            # Move to the start of the next line.
+            fh.seek(target - 1)
+            fh.readline()
+            offset = fh.tell()
+            if offset < size and offset > offsets[-1]:
+                offsets += [offset]
+
+    offsets += [size]
+
+    return list(zip(offsets[:-1], offsets[1:]))
+
+
+def _countlines(file, start, end, blocksize=2 ** 24):
+    """
+    Count the data rows starting within a byte range of a file, leaving out
+    blank and comment lines as numpy.genfromtxt does for CSVDB.
+
+    :return: Number of rows.
+    """
+
+    lines = 0
+    tail = b''
+
+    with open(file, 'rb') as fh:
+        fh.seek(start)
+        remaining = end - start
+        while remaining > 0:
+            block = fh.read(min(blocksize, remaining))
+            if not block:
+                break
+            remaining -= len(block)
+            block = tail + block
+
+            cut = block.rfind(b'\n') + 1
+            block, tail = block[:cut], block[cut:]
+            lines += sum(1 for _ in _DATALINE.finditer(block))
+
+    return lines + sum(1 for _ in _DATALINE.finditer(tail))
+
+
+def _fieldpattern(delimiter):
+    """
+    Return the compiled regular expression matching fields of a CSV block
+    that hold a single unquoted number, as numpy.genfromtxt reads them.
+
+    :param delimiter: Byte string separating fields.
+
+    :return: Compiled pattern with the groups of textdigits.numberpattern.
+    """
+
+    sep = re.escape(delimiter)
+
+    return re.compile(
+        rb'(?<![^' + sep + rb'\n])[ \t]*[-+]?'
+        rb'(?:(\d+)(?:\.(\d*))?|\.(\d+))'
+        rb'(?:[eE]([-+]?\d+))?'
+        rb'[ \t]*(?=' + sep + rb'|\r?\n|$)'
+    )
+
+
+def _included(value, rule):
+    """
+    Apply one filters.Rule to a value.
+
+    :return: True if the value passes the filter.
+    """
+
+    include, exclude, defaultinclude = rule
+
+    return value not in exclude and (value in include or defaultinclude)
+
+
+def _rangecounts(file, start, end, firstrow, spec, delimiter,
+                 blocksize=2 ** 24):
+    """
+    Count the first digits of the numbers within a byte range of a CSV file,
+    applying the row and column filters.
+
+    :param file: Name of the CSV file.
+    :param start: Byte offset of the first line of the range.
+    :param end: Byte offset after the last line of the range.
+    :param firstrow: Row number of the first line of the range.
+    :param spec: filters.CSVFilter to apply.
+    :param delimiter: Byte string separating fields.
+
+    :return: Numpy array of the counts of first digits 0-9.
+    """
+
+    rowlabels = spec.RowLabels
+    rownumbers = spec.RowNumbers
+    colnumbers = spec.ColNumbers
+    if spec.ColLabels.defaultinclude:
+        colnumbers = colnumbers._replace(defaultinclude=True)
+
+    allrows = (not rowlabels[1] and not rownumbers[1] and
+               (rowlabels[2] or rownumbers[2]))
+    allcols = not colnumbers[1] and colnumbers[2]
+
+    pattern = textdigits.numberpattern()
+    fieldpattern = _fieldpattern(delimiter)
+    counts = np.zeros(10, dtype=np.int64)
+    row = firstrow
+
+    with open(file, 'rb') as fh:
+        fh.seek(start)
+        remaining = end - start
+        tail = b''
+
+        while remaining > 0 or tail:
+            block = fh.read(min(blocksize, remaining)) if remaining > 0 \
+                else b''
+            if not block:
+                # End of file before the end of the range, e.g. of a file
+                # that shrank; count what was read.
+                remaining = 0
+            remaining -= len(block)
+            block = tail + block
+
+            if remaining > 0:
+                cut = block.rfind(b'\n') + 1
+                if cut == 0:
+                    tail = block
+                    continue
+                block, tail = block[:cut], block[cut:]
+            else:
+                tail = b''
+
+            if allrows and allcols:
+                if b'#' in block:
+                    block = _COMMENT.sub(b'', block)
+                firstdigits = [textdigits.tokendigits(intpart,
+                                                      frac or fraconly,
+                                                      exponent)[0]
+                               for intpart, frac, fraconly, exponent
+                               in fieldpattern.findall(block)]
+                counts += numerics.digitcounts(np.array(firstdigits,
+                                                        dtype=int))
+                row += block.count(b'\n')
+                continue
+
+            # Split on \n only, as _countlines counts rows, so that a bare
+            # \r does not start a row. Comments are cut, and blank and
+            # comment lines are not rows.
+            firstdigits = []
+            for line in block.split(b'\n'):
+                line = line.split(b'#', 1)[0]
+                if not line.strip():
+                    continue
+
+                fields = line.split(delimiter)
+                labels = set(field.strip().strip(b'"').decode(errors='ignore')
+                             for field in fields)
+
+                rowincl = any((labels & rowlabels[0]) |
+                              ({row} & rownumbers[0]))
+                rowexcl = any((labels & rowlabels[1]) |
+                              ({row} & rownumbers[1]))
+                row += 1
+
+                if rowexcl or not (rowincl or rowlabels[2] or rownumbers[2]):
+                    continue
+
+                for col, field in enumerate(fields):
+                    if not _included(col, colnumbers):
+                        continue
+
+                    token = pattern.fullmatch(field.strip())
+                    if token is not None:
+                        intpart, frac, fraconly, exponent = token.groups()
+                        firstdigits += [textdigits.tokendigits(
+                            intpart or b'', frac or fraconly or b'',
+                            exponent or b'')[0]]
+
+            counts += numerics.digitcounts(np.array(firstdigits, dtype=int))
+
+    return counts
+
+
+def parallelcounts(file, processes=None, spec=None, delimiter=',',
+                   parts=None):
+    """
+    Count the first digits of the numbers in a CSV file, splitting it into
+    byte ranges aligned to line boundaries that are parsed by worker
+    processes. Row numbers are kept correct by first counting the lines of
+    each range. Digits are read from the text of the numbers, see textdigits.
+
+    Row labels and row and column numbers are filtered as for CSVDB; row
+    labels are matched against the text of the fields, without surrounding
+    quotes. Rows are numbered as numpy.genfromtxt reads them for CSVDB: blank
+    lines and comment lines (starting with #) are not rows, text after # is
+    cut, and quoted numbers are not read. Column labels need a whole column
+    and are not supported.
+
+    :param file: Name of the CSV file.
+    :param processes: Number of worker processes; default is None, which
+    uses the number of CPUs.
+    :param spec: filters.CSVFilter to apply; default is None, which uses the
+    class attributes of CSVDB.Filter.
+    :param delimiter: String separating fields.
+    :param parts: Number of byte ranges; default is None, which uses four
+    per process.
+
+    :return: Numpy array of the counts of first digits 0-9, for
+    numerics.histogramtest.
+    """
+
+    if spec is None:
+        spec = CSVFilter.fromclass(CSVDB.Filter)
+
+    if spec.ColLabels.include or spec.ColLabels.exclude:
+        raise ValueError("Column labels cannot be filtered in parallel.")
+
+    processes = processes or os.cpu_count() or 1
+    ranges = byteranges(file, parts or 4 * processes)
+    starts = [start for start, end in ranges]
+    ends = [end for start, end in ranges]
+
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        lines = list(executor.map(_countlines, [file] * len(ranges),
+                                  starts, ends))
+        firstrows = np.concatenate(([0], np.cumsum(lines)[:-1])).tolist()
+
+        counts = executor.map(_rangecounts,
+                              [file] * len(ranges),
+                              starts,
+                              ends,
+                              firstrows,
+                              [spec] * len(ranges),
+                              [delimiter.encode()] * len(ranges)
+                              )
+
+        return np.sum(list(counts), axis=0)
@@ -61,16 +61,26 @@ class dataset:
 
     def updatefirstdigits(self):
         """
-        Update list of first digits of self.data.
+        Update list of first digits of self.data, exact for decimals such as
+        0.3 that floats store just below their value.
 
         :return: Return 0 for failure, 1 for successful update.
         """
 
-        firstdigit = np.vectorize(numerics.digitn)
-
-        self.firstdigits = firstdigit(1, self.data)
-
-        self.firstdigits = self.firstdigits.astype(int)
+        self.firstdigits = numerics.leadingdigits(self.data, 1).astype(int)
 
         # Superficial return
         return 1
+
+    def duplicates(self, k=10):
+        """
+        Find the most frequently repeated values of self.data.
+
+        :param k: Number of values to return.
+
+        :return: List of (value, count) tuples in order of decreasing count.
+        """
+
+        import benfordspy.duplication as duplication
+
+        return duplication.duplicates(self.data, k)
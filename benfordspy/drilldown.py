@@ -0,0 +1,140 @@
+"""
+This links digit buckets back to the source records of the numbers, so that
+the records behind an over-represented digit can be listed without reading
+the source again.
+
+Records are kept as parallel arrays: the values and integer source
+coordinates (e.g. sheet, row and column of an Excel cell, or row and column
+of a CSV field). A compressed sparse row (CSR) index maps each leading digit
+bucket to the positions of its records, so the records starting with given
+digits are a slice of the index.
+"""
+
+import numpy as np
+
+import benfordspy.numerics as numerics
+
+
+class DigitIndex:
+
+    """
+    CSR index from bucket to record positions. The positions of the records
+    in bucket b are indices[indptr[b]:indptr[b + 1]], in record order.
+
+    :param buckets: 1-D numpy int array of the bucket of each record.
+    :param nbuckets: Number of buckets.
+    """
+
+    def __init__(self, buckets, nbuckets):
+        buckets = np.asarray(buckets, dtype=np.int64)
+
+        self.indices = np.argsort(buckets, kind='stable')
+        self.indptr = np.zeros(nbuckets + 1, dtype=np.int64)
+        self.indptr[1:] = np.cumsum(np.bincount(buckets, minlength=nbuckets))
+
+    def positions(self, first, last=None):
+        """
+        Return the positions of the records in buckets first to last.
+
+        :param first: First bucket.
+        :param last: Last bucket, inclusive; default is None, which is first.
+
+        :return: 1-D numpy int array of record positions.
+        """
+
+        if last is None:
+            last = first
+
+        return self.indices[self.indptr[first]:self.indptr[last + 1]]
+
+    def counts(self):
+        """
+        Return the number of records in each bucket.
+
+        :return: 1-D numpy int array of counts.
+        """
+
+        return np.diff(self.indptr)
+
+
+class DrillDown:
+
+    """
+    Records of extracted numbers with their source coordinates, indexed by
+    their n leading digits.
+
+    :param values: 1-D list or numpy array of numbers.
+    :param coordinates: Dictionary of 1-D int arrays parallel to values, as
+    returned by the extractnumbers methods with coordinates=True. Excel rows
+    and columns are 1-based, as in the worksheet. CSV rows and columns are
+    0-based, as for the row and column number filters, and rows leave out
+    blank and comment lines; the CSV "line" is the 1-based line of the file.
+    :param n: Number of leading digits to index; default is 2, which serves
+    lookups of both first digits and first two digits.
+    :param sheets: Optional list of worksheet names, to name the "sheet"
+    coordinate in records.
+    """
+
+    def __init__(self, values, coordinates, n=2, sheets=None):
+        self.values = np.asarray(values, dtype=float)
+        self.coordinates = {name: np.asarray(coordinate, dtype=np.int32)
+                            for name, coordinate in coordinates.items()}
+        self.n = n
+        self.sheets = sheets
+
+        for coordinate in self.coordinates.values():
+            if coordinate.shape != self.values.shape:
+                raise ValueError("Coordinates are not parallel to values.")
+
+        self.leading = numerics.leadingdigits(self.values, n)
+        self.index = DigitIndex(self.leading, 10 ** n)
+
+    @property
+    def firstdigits(self):
+        """
+        First digits of the values, e.g. for numerics.digitcounts.
+        """
+
+        return numerics.leadingdigits(self.values, 1)
+
+    def positions(self, digits):
+        """
+        Return the positions of the records whose leading digits are digits,
+        e.g. 4 or 48 for an index of two digits.
+
+        :param digits: Leading digits, with at most n digits.
+
+        :return: 1-D numpy int array of record positions, ordered by the n
+        leading digits and then by record.
+        """
+
+        width = len(str(digits))
+        if digits < 1 or width > self.n:
+            raise ValueError("Digits {} are not 1 to {} leading digits."
+                             .format(digits, self.n))
+
+        scale = 10 ** (self.n - width)
+
+        return self.index.positions(digits * scale, (digits + 1) * scale - 1)
+
+    def records(self, digits):
+        """
+        Return the records whose leading digits are digits.
+
+        :param digits: Leading digits, with at most n digits.
+
+        :return: Dictionary of 1-D numpy arrays of "value" and each
+        coordinate, plus "sheetname" if worksheet names were given.
+        """
+
+        positions = self.positions(digits)
+
+        records = {"value": self.values[positions]}
+        for name, coordinate in self.coordinates.items():
+            records[name] = coordinate[positions]
+
+        if self.sheets is not None and "sheet" in records:
+            records["sheetname"] = np.array(self.sheets,
+                                            dtype=object)[records["sheet"]]
+
+        return records
@@ -0,0 +1,185 @@
+"""
+This contains the number duplication test, which finds the most frequently
+repeated values in the data. It is usually run alongside the Benford's law
+test in forensic work, as repeated amounts (e.g. invoices just below an
+approval limit) are a common sign of manipulated data.
+
+Data that fits in memory is counted exactly by hashing with numpy.unique.
+Unbounded feeds can be counted in bounded memory with the SpaceSaving class.
+"""
+
+import heapq
+
+import numpy as np
+
+
+def duplicates(data, k=10):
+    """
+    Find the k most frequently repeated values in the data. Ties are ordered
+    by value.
+
+    :param data: 1-D numpy array or list of numbers.
+    :param k: Number of values to return.
+
+    :return: List of (value, count) tuples in order of decreasing count.
+    """
+
+    values, counts = np.unique(np.asarray(data), return_counts=True)
+
+    order = np.argsort(-counts, kind='stable')[:k]
+
+    return list(zip(values[order].tolist(), counts[order].tolist()))
+
+
+def repeatrates(data, groups):
+    """
+    Calculate for each group the fraction of its records whose value occurs
+    more than once within that group.
+
+    :param data: 1-D numpy array or list of numbers.
+    :param groups: 1-D numpy array or list of group keys, one per number.
+
+    :return: Dictionary with keys of group and values of repeat rate.
+    """
+
+    data = np.asarray(data)
+    groups = np.asarray(groups)
+
+    if data.shape != groups.shape or data.ndim != 1:
+        raise ValueError("Data and groups are not 1-D and of equal length.")
+
+    groupkeys, groupcodes = np.unique(groups, return_inverse=True)
+    valuecodes = np.unique(data, return_inverse=True)[1]
+
+    # Count each (group, value) pair and map the counts back to the records.
+    pairs = np.stack((groupcodes.ravel(), valuecodes.ravel()), axis=1)
+    pairinverse, paircounts = np.unique(pairs,
+                                        axis=0,
+                                        return_inverse=True,
+                                        return_counts=True)[1:]
+    repeated = paircounts[pairinverse.ravel()] > 1
+
+    totals = np.bincount(groupcodes.ravel(), minlength=groupkeys.size)
+    repeats = np.bincount(groupcodes.ravel(),
+                          weights=repeated,
+                          minlength=groupkeys.size)
+
+    return dict(zip(groupkeys.tolist(), (repeats / totals).tolist()))
+
+
+class SpaceSaving:
+
+    """
+    Approximate heavy-hitter counter of Metwally et al. using a fixed number
+    of counters. Any value occurring more than N / capacity times in a stream
+    of N values is guaranteed to be counted, and each count overestimates the
+    true count by at most its error.
+    """
+
+    def __init__(self, capacity=1000):
+        if capacity < 1:
+            raise ValueError("Capacity must be at least 1.")
+
+        self.capacity = capacity
+        self.N = 0
+        self.counts = {}
+        self.errors = {}
+        # Min-heap of (count, value); entries whose count is out of date are
+        # skipped when popped.
+        self._heap = []
+
+    def update(self, values):
+        """
+        Count a batch of values from the stream.
+
+        :param values: Iterable of numbers.
+
+        :return: Nothing.
+        """
+
+        for value, count in zip(*np.unique(np.asarray(values),
+                                           return_counts=True)):
+            self.add(value.item(), int(count))
+
+    def add(self, value, count=1):
+        """
+        Count a single value, optionally occurring several times.
+
+        :param value: Number to count.
+        :param count: Number of occurrences.
+
+        :return: Nothing.
+        """
+
+        self.N += count
+
+        if value in self.counts:
+            self.counts[value] += count
+        elif len(self.counts) < self.capacity:
+            self.counts[value] = count
+            self.errors[value] = 0
+        else:
+            minvalue, mincount = self._popmin()
+            del self.counts[minvalue]
+            del self.errors[minvalue]
+            self.counts[value] = mincount + count
+            self.errors[value] = mincount
+
+        heapq.heappush(self._heap, (self.counts[value], value))
+
+        if len(self._heap) > 4 * self.capacity:
+            self._heap = [(c, v) for v, c in self.counts.items()]
+            heapq.heapify(self._heap)
+
+    def _popmin(self):
+        while True:
+            count, value = heapq.heappop(self._heap)
+            if self.counts.get(value) == count:
+                return value, count
+
+    def merge(self, other):
+        """
+        Merge the counters of another SpaceSaving, e.g. from a parallel
+        worker, into this one. The merged counts keep the error guarantee
+        for the combined stream.
+
+        :param other: SpaceSaving to merge.
+
+        :return: Nothing.
+        """
+
+        floor = min(self.counts.values()) \
+            if len(self.counts) == self.capacity else 0
+        otherfloor = min(other.counts.values()) \
+            if len(other.counts) == other.capacity else 0
+
+        counts = {}
+        errors = {}
+        for value in set(self.counts) | set(other.counts):
+            counts[value] = (self.counts.get(value, floor) +
+                             other.counts.get(value, otherfloor))
+            errors[value] = (self.errors.get(value, floor) +
+                             other.errors.get(value, otherfloor))
+
+        kept = sorted(counts, key=lambda v: -counts[v])[:self.capacity]
+
+        self.N += other.N
+        self.counts = {value: counts[value] for value in kept}
+        self.errors = {value: errors[value] for value in kept}
+        self._heap = [(c, v) for v, c in self.counts.items()]
+        heapq.heapify(self._heap)
+
+    def top(self, k=10):
+        """
+        Return the k values with the highest estimated counts.
+
+        :param k: Number of values to return.
+
+        :return: List of (value, count, error) tuples in order of decreasing
+        count; the true count lies between count - error and count.
+        """
+
+        kept = sorted(self.counts, key=lambda v: (-self.counts[v], v))[:k]
+
+        return [(value, self.counts[value], self.errors[value])
+                for value in kept]
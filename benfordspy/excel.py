@@ -3,13 +3,26 @@ This class accesses data from excel data sheets.
 
 Features to implement:
 - Apply regular expressions to filter.
-- Filter by cell range.
 """
 
+import os
+import pickle
+import zipfile
+from xml.etree import ElementTree
+
+import numpy as np
 from openpyxl import (load_workbook,
                       utils
                       )
 
+import benfordspy.numerics as numerics
+import benfordspy.dataset as dataset
+from benfordspy.filters import ExcelFilter, Rule
+
+_MAIN = 'http://schemas.openxmlformats.org/spreadsheetml/2006/main'
+_RELS = ('http://schemas.openxmlformats.org/officeDocument/2006/'
+         'relationships')
+
 
 class ExcelDB:
 
@@ -24,8 +37,8 @@ class ExcelDB:
 
     class Filter:
         """
-        This class holds the filters applied to the excel sheet to determine
-        the numbers that will be passed on for the Benford Law's test.
+        This class holds the default filters applied to the excel sheet to
+        determine the numbers that will be passed on for the Benford Law's test.
         There are three parameters: row labels, column labels, worksheets, and
         cell range. By default all these include any number cells in the
         worksheet but can be restricted to include or exclude certain cells
@@ -37,8 +50,14 @@ class ExcelDB:
         to the defaultinclude setting.
         Row and column labels are strings, and are applied to any cell within
         the row or column.
-        Cell ranges are numerical.
+        Cell ranges are Excel range strings (e.g. "B2:D40" or "F:F") or
+        tuples of 1-based (min_col, min_row, max_col, max_row). Only the
+        bounding box of the ranges that can contribute is read, so restricting
+        cell ranges on a large worksheet reads only a small part of it.
         All matches are exact, including string case.
+        Filters passed to extractnumbers as a filters.ExcelFilter take
+        precedence over these class attributes, which are shared by every
+        ExcelDB.
         """
 
         class WorkSheets:
@@ -64,40 +83,101 @@ class ExcelDB:
             include = set()
             exclude = set()
 
-            defaultinclude = False
+            defaultinclude = True
 
-    def extractnumbers(self):
+    def extractnumbers(self, spec=None, coordinates=False):
         """
-        Apply the filters set in the Filter class and return the set of all
+        Apply the filters of a filter specification and return the set of all
         numbers from the Excel file.
 
-        :return: List of numbers from Excel file subject to Filter.
+        Only the bounding box of the cell ranges that can contribute is read
+        from each worksheet, widened to whole rows of the box if row labels
+        are filtered and to whole columns of the box if column labels are, so
+        that labels outside the box are still matched.
+
+        :param spec: filters.ExcelFilter to apply; default is None, which uses
+        the class attributes of the Filter class.
+        :param coordinates: Flag to also return the source cell of each
+        number; default is False.
+
+        :return: List of numbers from Excel file subject to Filter. If
+        coordinates is True, a tuple of that list and a dictionary of 1-D
+        numpy int32 arrays, parallel to the list, of "sheet" (index into
+        self.wslist), "row" and "col" (1-based).
         """
 
+        if spec is None:
+            spec = ExcelFilter.fromclass(self.Filter)
+
         datareturn = []
+        sheets = []
+        cellrows = []
+        cellcols = []
 
-        for worksheet in self.wslist:
-            if worksheet in self.Filter.WorkSheets.include:
+        incranges = cellranges(spec.CellRange.include)
+        excranges = cellranges(spec.CellRange.exclude)
+        defaultinclude = spec.CellRange.defaultinclude
 
-                ws = self.wb[worksheet]
+        for sheet, worksheet in enumerate(self.wslist):
+            if worksheet in spec.WorkSheets.include:
 
-                lastcell = (utils.get_column_letter(ws.max_column) +
-                            str(ws.max_row)
-                            )
+                ws = self.wb[worksheet]
 
-                cells = ws['A1': lastcell]
+                box = boundingbox(incranges,
+                                  defaultinclude,
+                                  ws.max_row,
+                                  ws.max_column
+                                  )
+                if box is None:
+                    continue
+
+                min_row, max_row, min_col, max_col = box
+
+                # Labels may lie outside the box, e.g. in column A for a
+                # cell range of column F, so rows are read across every
+                # column if row labels are filtered, and columns down every
+                # row if column labels are.
+                rowlabels = bool(spec.RowLabels.include or
+                                 spec.RowLabels.exclude)
+                collabels = bool(spec.ColLabels.include or
+                                 spec.ColLabels.exclude)
+
+                if rowlabels:
+                    lo_col, hi_col = 1, ws.max_column
+                else:
+                    lo_col, hi_col = min_col, max_col
+                rowcells = list(ws.iter_rows(min_row=min_row,
+                                             max_row=max_row,
+                                             min_col=lo_col,
+                                             max_col=hi_col,
+                                             values_only=True
+                                             ))
+                stop = None if max_col is None else max_col - lo_col + 1
+                cells = [row[min_col - lo_col:stop] for row in rowcells]
+
+                if max_col is None:
+                    max_col = min_col - 1 + max((len(row) for row in cells),
+                                                default=0)
+
+                colcells = cells
+                if collabels and (min_row > 1 or max_row != ws.max_row):
+                    colcells = list(ws.iter_rows(min_row=1,
+                                                 max_row=ws.max_row,
+                                                 min_col=min_col,
+                                                 max_col=max_col,
+                                                 values_only=True
+                                                 ))
 
                 # Find range of cells that conform to Filter
 
                 # Filter rows
                 rows = []
-                for idx in range(ws.max_row):
-                    rw = cells[idx]
-                    rwcells = set([cell.value for cell in rw])
+                for idx, rw in enumerate(rowcells):
+                    rwcells = set(rw)
 
-                    ifincl = any(rwcells & self.Filter.RowLabels.include)
-                    ifexcl = any(rwcells & self.Filter.RowLabels.exclude)
-                    ifdefault = self.Filter.RowLabels.defaultinclude
+                    ifincl = any(rwcells & spec.RowLabels.include)
+                    ifexcl = any(rwcells & spec.RowLabels.exclude)
+                    ifdefault = spec.RowLabels.defaultinclude
 
                     if ifexcl is False and any((ifincl, ifdefault)):
                         rows += [idx]
@@ -105,22 +185,283 @@ class ExcelDB:
                 # Filter columns
                 columns = []
 
-                for idx in range(ws.max_column):
-                    cl = tuple(row[idx] for row in cells)
-                    clcells = set([cell.value for cell in cl])
+                for idx in range(max_col - min_col + 1):
+                    clcells = set(row[idx] for row in colcells
+                                  if idx < len(row))
 
-                    ifincl = any(set(rwcells) & self.Filter.ColLabels.include)
-                    ifexcl = any(set(rwcells) & self.Filter.ColLabels.exclude)
-                    ifdefault = self.Filter.ColLabels.defaultinclude
+                    ifincl = any(clcells & spec.ColLabels.include)
+                    ifexcl = any(clcells & spec.ColLabels.exclude)
+                    ifdefault = spec.ColLabels.defaultinclude
 
                     if ifexcl is False and any((ifincl, ifdefault)):
                         columns += [idx]
 
                 # Extract data from Excel sheet
                 for rw in rows:
+                    row = cells[rw]
                     for cl in columns:
-                        value = cells[rw][cl].value
-                        if isinstance(value, (int, float)) and value != 0:
+                        if cl >= len(row):
+                            continue
+
+                        value = row[cl]
+                        if not isinstance(value, (int, float)) or value == 0:
+                            continue
+
+                        cellrow = min_row + rw
+                        cellcol = min_col + cl
+                        if incell(excranges, cellrow, cellcol):
+                            continue
+                        if (defaultinclude or
+                                incell(incranges, cellrow, cellcol)):
                             datareturn += [value]
+                            if coordinates:
+                                sheets += [sheet]
+                                cellrows += [cellrow]
+                                cellcols += [cellcol]
+
+        if coordinates:
+            return datareturn, {"sheet": np.array(sheets, dtype=np.int32),
+                                "row": np.array(cellrows, dtype=np.int32),
+                                "col": np.array(cellcols, dtype=np.int32)}
 
         return datareturn
+
+
+def cellranges(ranges):
+    """
+    Convert a set of cell ranges to numerical bounds. A range is either an
+    Excel range string such as "B2:D40", "F:F" or "3:7", or a tuple of
+    (min_col, min_row, max_col, max_row) with 1-based indices. Unbounded sides
+    are None.
+
+    :param ranges: Set of cell ranges.
+
+    :return: List of (min_col, min_row, max_col, max_row) tuples.
+    """
+
+    bounds = []
+
+    for rng in ranges:
+        if isinstance(rng, str):
+            rng = utils.range_boundaries(rng)
+
+        if len(rng) != 4:
+            raise ValueError("Cell range {} is not of the form (min_col, "
+                             "min_row, max_col, max_row).".format(rng))
+
+        bounds += [tuple(rng)]
+
+    return bounds
+
+
+def boundingbox(ranges, defaultinclude, max_row, max_col):
+    """
+    Return the smallest block of a worksheet holding every cell that may pass
+    the cell range filter.
+
+    :param ranges: List of included cell range bounds from cellranges.
+    :param defaultinclude: Flag to include cells outside included ranges.
+    :param max_row: Last row of the worksheet, or None if unknown, as for
+    read-only worksheets without a stored dimension.
+    :param max_col: Last column of the worksheet, or None if unknown.
+
+    :return: Tuple of (min_row, max_row, min_col, max_col), where max_row and
+    max_col are None if unbounded and unknown, or None if no cell can be
+    included.
+    """
+
+    if defaultinclude:
+        return 1, max_row, 1, max_col
+
+    if not ranges:
+        return None
+
+    lo_row = min(rng[1] or 1 for rng in ranges)
+    hi_row = _highest([rng[3] for rng in ranges], max_row)
+    lo_col = min(rng[0] or 1 for rng in ranges)
+    hi_col = _highest([rng[2] for rng in ranges], max_col)
+
+    if ((hi_row is not None and lo_row > hi_row) or
+            (hi_col is not None and lo_col > hi_col)):
+        return None
+
+    return lo_row, hi_row, lo_col, hi_col
+
+
+def _highest(bounds, limit):
+    """
+    Return the highest of the upper bounds of cell ranges, within a limit.
+
+    :param bounds: List of upper bounds, None where unbounded.
+    :param limit: Last row or column of the worksheet, or None if unknown.
+
+    :return: Highest bound, or None if unbounded and the limit is unknown.
+    """
+
+    if any(bound is None for bound in bounds):
+        return limit
+
+    if limit is None:
+        return max(bounds)
+
+    return min(max(bounds), limit)
+
+
+def incell(ranges, row, col):
+    """
+    Check whether a cell lies within any of the cell ranges.
+
+    :param ranges: List of cell range bounds from cellranges.
+    :param row: Row of the cell, 1-based.
+    :param col: Column of the cell, 1-based.
+
+    :return: True if the cell is in a range, False otherwise.
+    """
+
+    for min_col, min_row, max_col, max_row in ranges:
+        if ((min_row is None or row >= min_row) and
+                (max_row is None or row <= max_row) and
+                (min_col is None or col >= min_col) and
+                (max_col is None or col <= max_col)):
+            return True
+
+    return False
+
+
+def sheetparts(file):
+    """
+    Find the part of the .xlsx zip archive holding each worksheet.
+
+    :param file: Excel file.
+
+    :return: Dictionary with keys of worksheet name and values of the name of
+    its XML part in the archive.
+    """
+
+    with zipfile.ZipFile(file) as archive:
+        workbook = ElementTree.fromstring(archive.read('xl/workbook.xml'))
+        rels = ElementTree.fromstring(
+            archive.read('xl/_rels/workbook.xml.rels'))
+
+    targets = {rel.get('Id'): rel.get('Target') for rel in rels}
+
+    parts = {}
+    for sheet in workbook.iter('{' + _MAIN + '}sheet'):
+        target = targets[sheet.get('{' + _RELS + '}id')]
+        if target.startswith('/'):
+            parts[sheet.get('name')] = target[1:]
+        else:
+            parts[sheet.get('name')] = 'xl/' + target
+
+    return parts
+
+
+def sheetfingerprints(file, labels=False):
+    """
+    Fingerprint each worksheet of an .xlsx file by the CRC-32 and size of its
+    XML part, read from the zip directory without decompressing anything.
+
+    :param file: Excel file.
+    :param labels: Flag to also fingerprint the shared strings, which must be
+    done when row or column labels are filtered as they are held there.
+
+    :return: Dictionary with keys of worksheet name and values of
+    fingerprint tuples.
+    """
+
+    parts = sheetparts(file)
+
+    with zipfile.ZipFile(file) as archive:
+        infos = {info.filename: info for info in archive.infolist()}
+
+    strings = ()
+    if labels and 'xl/sharedStrings.xml' in infos:
+        info = infos['xl/sharedStrings.xml']
+        strings = (info.CRC, info.file_size)
+
+    return {name: (infos[part].CRC, infos[part].file_size) + strings
+            for name, part in parts.items()}
+
+
+class SheetHistograms:
+
+    """
+    Store of the first digit counts of each worksheet of Excel files, so that
+    a re-saved workbook is re-read only for the worksheets whose XML changed.
+    Counts are kept per file, worksheet and filter specification.
+    """
+
+    def __init__(self):
+        self.sheets = {}
+        self.extracted = []
+
+    def counts(self, file, spec):
+        """
+        Return the first digit counts of the worksheets of a file in
+        spec.WorkSheets.include, re-extracting only changed worksheets. The
+        worksheets read are listed in self.extracted afterwards.
+
+        :param file: Excel file.
+        :param spec: filters.ExcelFilter to apply.
+
+        :return: Numpy array of the counts of first digits 0-9, merged over
+        the worksheets.
+        """
+
+        labels = bool(spec.RowLabels.include or spec.RowLabels.exclude or
+                      spec.ColLabels.include or spec.ColLabels.exclude)
+        fingerprints = sheetfingerprints(file, labels)
+
+        path = os.path.abspath(file)
+        counts = np.zeros(10, dtype=np.int64)
+        db = None
+        self.extracted = []
+
+        for name in fingerprints:
+            if name not in spec.WorkSheets.include:
+                continue
+
+            sheetspec = spec._replace(WorkSheets=Rule({name}))
+            key = (path, name, sheetspec)
+
+            stored = self.sheets.get(key)
+            if stored is None or stored[0] != fingerprints[name]:
+                if db is None:
+                    db = ExcelDB(file)
+
+                data = dataset.dataset()
+                data.datainit(db.extractnumbers(sheetspec))
+                data.updatefirstdigits()
+
+                stored = (fingerprints[name],
+                          numerics.digitcounts(data.firstdigits))
+                self.sheets[key] = stored
+                self.extracted += [name]
+
+            counts += stored[1]
+
+        return counts
+
+    def save(self, file):
+        """
+        Save the stored counts, e.g. between runs.
+
+        :param file: File to write to.
+
+        :return: Nothing.
+        """
+
+        with open(file, 'wb') as fh:
+            pickle.dump(self.sheets, fh)
+
+    def load(self, file):
+        """
+        Load counts saved by save, replacing those stored.
+
+        :param file: File to read from.
+
+        :return: Nothing.
+        """
+
+        with open(file, 'rb') as fh:
+            self.sheets = pickle.load(fh)
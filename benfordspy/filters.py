@@ -0,0 +1,120 @@
+"""
+This contains immutable filter specifications for the data sources.
+
+A filter specification is passed to each extraction instead of being set on
+the class attributes of ExcelDB.Filter or CSVDB.Filter, so analyses running
+at the same time, in threads or one after the other, do not leak filters
+into each other. Specifications are hashable, so together with a file they
+can key a cache of results.
+
+The fields have the names of the nested classes of ExcelDB.Filter and
+CSVDB.Filter, and each holds a Rule with include, exclude and defaultinclude,
+so spec.RowLabels.include reads as Filter.RowLabels.include did.
+"""
+
+from collections import namedtuple
+
+
+class Rule(namedtuple('Rule', ['include', 'exclude', 'defaultinclude'])):
+
+    """
+    One include / exclude filter. A value passes if it is not excluded and it
+    is included or defaultinclude is True.
+    """
+
+    __slots__ = ()
+
+    def __new__(cls, include=None, exclude=None, defaultinclude=False):
+        return super().__new__(cls,
+                               frozenset(include or ()),
+                               frozenset(exclude or ()),
+                               bool(defaultinclude)
+                               )
+
+    @classmethod
+    def fromclass(cls, rule):
+        """
+        Build a Rule from a class with include, exclude and defaultinclude
+        attributes, such as ExcelDB.Filter.RowLabels. Missing attributes
+        take their default.
+
+        :param rule: Class holding the filter, or None.
+
+        :return: Rule.
+        """
+
+        return cls(getattr(rule, 'include', None),
+                   getattr(rule, 'exclude', None),
+                   getattr(rule, 'defaultinclude', False)
+                   )
+
+
+class ExcelFilter(namedtuple('ExcelFilter', ['WorkSheets',
+                                             'RowLabels',
+                                             'ColLabels',
+                                             'CellRange'])):
+
+    """
+    Filter specification of ExcelDB.extractnumbers. Only worksheets in
+    WorkSheets.include are read.
+    """
+
+    __slots__ = ()
+
+    def __new__(cls,
+                WorkSheets=Rule(),
+                RowLabels=Rule(),
+                ColLabels=Rule(),
+                CellRange=Rule(defaultinclude=True)
+                ):
+        return super().__new__(cls, WorkSheets, RowLabels, ColLabels,
+                               CellRange)
+
+    @classmethod
+    def fromclass(cls, Filter):
+        """
+        Build a specification from the class attributes of a class of the form
+        of ExcelDB.Filter.
+
+        :param Filter: Class holding the filters.
+
+        :return: ExcelFilter.
+        """
+
+        return cls(*(Rule.fromclass(getattr(Filter, name, None))
+                     for name in cls._fields))
+
+
+class CSVFilter(namedtuple('CSVFilter', ['RowLabels',
+                                         'ColLabels',
+                                         'RowNumbers',
+                                         'ColNumbers'])):
+
+    """
+    Filter specification of CSVDB.extractnumbers and csv.parallelcounts.
+    """
+
+    __slots__ = ()
+
+    def __new__(cls,
+                RowLabels=Rule(),
+                ColLabels=Rule(),
+                RowNumbers=Rule(),
+                ColNumbers=Rule()
+                ):
+        return super().__new__(cls, RowLabels, ColLabels, RowNumbers,
+                               ColNumbers)
+
+    @classmethod
+    def fromclass(cls, Filter):
+        """
+        Build a specification from the class attributes of a class of the form
+        of CSVDB.Filter.
+
+        :param Filter: Class holding the filters.
+
+        :return: CSVFilter.
+        """
+
+        return cls(*(Rule.fromclass(getattr(Filter, name, None))
+                     for name in cls._fields))
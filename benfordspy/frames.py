@@ -0,0 +1,244 @@
+"""
+This reads numbers from pandas and Apache Arrow data without copying them
+into Python lists.
+
+Columns are read through their underlying buffers: numpy arrays of pandas
+Series, the data and mask arrays of pandas nullable types, and the data and
+validity bitmap buffers of each chunk of an Arrow array. Nulls (and NaN) are
+left out through the validity masks. First digits are counted chunk by chunk,
+optionally per group given by key columns, so that per-group statistics are
+computed straight from a DataFrame or Table.
+
+pandas and pyarrow are optional; neither is imported unless such data is
+passed in.
+"""
+
+import numpy as np
+
+import benfordspy.numerics as numerics
+
+
+def _frommodule(data, module):
+    return type(data).__module__.split('.')[0] == module
+
+
+def _arrowchunks(array):
+    """
+    Yield the values and validity of each chunk of an Arrow array, viewing
+    its buffers without copying.
+
+    :param array: pyarrow Array or ChunkedArray of integers or floats.
+
+    :return: Generator of (values, valid) pairs of numpy arrays; valid is
+    None where the chunk has no nulls.
+    """
+
+    import pyarrow as pa
+
+    chunks = array.chunks if isinstance(array, pa.ChunkedArray) else [array]
+
+    for chunk in chunks:
+        if not (pa.types.is_integer(chunk.type) or
+                pa.types.is_floating(chunk.type)):
+            raise TypeError("Arrow array of type {} is not numeric."
+                            .format(chunk.type))
+
+        validity, data = chunk.buffers()[:2]
+        start = chunk.offset
+        stop = start + len(chunk)
+
+        values = np.frombuffer(data,
+                               dtype=chunk.type.to_pandas_dtype(),
+                               count=stop)[start:]
+
+        valid = None
+        if validity is not None and chunk.null_count > 0:
+            bits = np.frombuffer(validity, dtype=np.uint8)
+            valid = np.unpackbits(bits, bitorder='little')[start:stop]
+            valid = valid.astype(bool)
+
+        yield values, valid
+
+
+def _pandaschunks(series):
+    """
+    Yield the values and validity of a pandas Series without copying.
+
+    :param series: pandas Series of integers or floats, of numpy, nullable
+    or Arrow-backed dtype.
+
+    :return: Generator of (values, valid) pairs of numpy arrays; valid is
+    None where there are no nulls.
+    """
+
+    import pandas as pd
+
+    if not pd.api.types.is_numeric_dtype(series.dtype) or \
+            pd.api.types.is_bool_dtype(series.dtype):
+        raise TypeError("Series of type {} is not numeric."
+                        .format(series.dtype))
+
+    if isinstance(series.dtype, pd.ArrowDtype):
+        yield from _arrowchunks(series.array.__arrow_array__())
+
+    elif isinstance(series.array, pd.arrays.IntegerArray) or \
+            isinstance(series.array, pd.arrays.FloatingArray):
+        mask = series.array._mask
+        yield series.array._data, ~mask if mask.any() else None
+
+    else:
+        yield series.to_numpy(copy=False), None
+
+
+def chunks(column):
+    """
+    Yield the values and validity of a column of any supported type.
+
+    :param column: pandas Series, pyarrow Array or ChunkedArray, numpy array
+    or list of numbers.
+
+    :return: Generator of (values, valid) pairs of numpy arrays; valid is
+    None where there are no nulls.
+    """
+
+    if _frommodule(column, 'pandas'):
+        yield from _pandaschunks(column)
+    elif _frommodule(column, 'pyarrow'):
+        yield from _arrowchunks(column)
+    else:
+        yield np.asarray(column, dtype=float), None
+
+
+def _columns(data, names):
+    """
+    Return the named columns of a pandas DataFrame or pyarrow Table.
+
+    :return: List of columns.
+    """
+
+    if _frommodule(data, 'pandas'):
+        return [data[name] for name in names]
+
+    return [data.column(name) for name in names]
+
+
+def _isframe(data):
+    """
+    Return whether data is a pandas DataFrame or pyarrow Table, rather than
+    a single column.
+
+    :return: True if a DataFrame or Table.
+    """
+
+    if _frommodule(data, 'pandas'):
+        return hasattr(data, 'columns')
+
+    return _frommodule(data, 'pyarrow') and hasattr(data, 'column_names')
+
+
+def groupcodes(data, groupby):
+    """
+    Encode the key columns of a DataFrame or Table as integer group codes.
+
+    :param data: pandas DataFrame or pyarrow Table.
+    :param groupby: Name or list of names of the key columns.
+
+    :return: Tuple of a 1-D numpy int array of the group code of each row
+    and the list of group keys, a tuple per group if several columns.
+    """
+
+    names = [groupby] if isinstance(groupby, str) else list(groupby)
+
+    codes = []
+    uniques = []
+    for column in _columns(data, names):
+        if _frommodule(column, 'pandas'):
+            import pandas as pd
+            code, unique = pd.factorize(column, use_na_sentinel=False)
+            unique = [None if pd.isna(key) else key for key in unique]
+        else:
+            encoded = column.combine_chunks().dictionary_encode()
+            code = encoded.indices.to_numpy(zero_copy_only=False)
+            unique = encoded.dictionary.to_pylist()
+            if encoded.null_count:
+                code = np.where(encoded.is_null().to_numpy(
+                    zero_copy_only=False), len(unique), code)
+                unique += [None]
+        codes += [np.asarray(code, dtype=np.int64)]
+        uniques += [unique]
+
+    if len(codes) == 1:
+        return codes[0], uniques[0]
+
+    combined, code = np.unique(np.stack(codes, axis=1),
+                               axis=0,
+                               return_inverse=True)
+    keys = [tuple(unique[idx] for unique, idx in zip(uniques, row))
+            for row in combined]
+
+    return code.ravel(), keys
+
+
+def framecounts(data, column=None, groupby=None):
+    """
+    Count the first digits of a column, optionally per group. Nulls, NaN
+    and zeros are left out, as for the other sources.
+
+    :param data: pandas Series or DataFrame, pyarrow Array, ChunkedArray or
+    Table, or numpy array.
+    :param column: Name of the column of a DataFrame or Table to analyze;
+    may be left out for a DataFrame or Table of a single column without
+    groupby.
+    :param groupby: Name or list of names of key columns of a DataFrame or
+    Table to group by; default is None.
+
+    :return: Numpy array of the counts of first digits 0-9 or, with
+    groupby, a tuple of an array of shape (groups, 10) of the counts of
+    each group and the list of group keys.
+    """
+
+    if column is not None:
+        values = _columns(data, [column])[0]
+    elif _isframe(data):
+        names = list(data.columns) if _frommodule(data, 'pandas') \
+            else data.column_names
+        if len(names) != 1 or groupby is not None:
+            raise ValueError("Give the column of the DataFrame or Table to "
+                             "analyze.")
+        values = _columns(data, names)[0]
+    else:
+        values = data
+
+    if groupby is None:
+        counts = np.zeros(10, dtype=np.int64)
+        for chunk, valid in chunks(values):
+            if valid is not None:
+                chunk = chunk[valid]
+            chunk = chunk[np.isfinite(chunk)] if chunk.dtype.kind == 'f' \
+                else chunk
+            counts += numerics.digitcounts(numerics.leadingdigits(chunk))
+        counts[0] = 0
+
+        return counts
+
+    codes, keys = groupcodes(data, groupby)
+
+    counts = np.zeros(len(keys) * 10, dtype=np.int64)
+    start = 0
+    for chunk, valid in chunks(values):
+        stop = start + len(chunk)
+        code = codes[start:stop]
+        start = stop
+
+        keep = np.ones(len(chunk), dtype=bool) if valid is None else valid
+        if chunk.dtype.kind == 'f':
+            keep = keep & np.isfinite(chunk)
+
+        digits = numerics.leadingdigits(chunk[keep])
+        counts += np.bincount(code[keep] * 10 + digits,
+                              minlength=len(keys) * 10)
+
+    counts = counts.reshape(len(keys), 10)
+    counts[:, 0] = 0
+
+    return counts, keys
@@ -0,0 +1,297 @@
+"""
+This extends the Benford's law tests to other bases and to the generalized
+Benford family of first digit distributions.
+
+The generalized Benford law (Pietronero et al., 2001) is the first digit
+distribution of data whose density falls as a power law, p(x) ~ x^-alpha, as
+for Pareto distributed data:
+
+    P(d) = (d^(1 - alpha) - (d + 1)^(1 - alpha)) / (1 - b^(1 - alpha))
+
+in base b. alpha = 1 gives Benford's law, alpha = 0 uniform first digits.
+Morrow (2014) discusses such families of Benford-like distributions.
+
+Expected tables are cached, alpha is fitted to histograms of first digits by
+maximum likelihood for many histograms at once, and screen compares a stack
+of histograms against several reference distributions in one pass with the
+same test statistics as numerics.statistic.
+"""
+
+from functools import lru_cache
+
+import numpy as np
+
+import benfordspy.numerics as numerics
+
+
+def firstdigits(data, base=10):
+    """
+    Returns the most significant digit in a base of each input number. Zeros
+    return 0.
+
+    :param data: Numpy array of numbers.
+    :param base: Integer base, at least 2.
+
+    :return: Numpy int array of first digits, 1 to base - 1.
+    """
+
+    if base == 10:
+        return numerics.leadingdigits(data, 1)
+
+    data = np.absolute(np.asarray(data, dtype=float))
+    nonzero = data > 0
+
+    exponent = np.zeros(data.shape, dtype=int)
+    exponent[nonzero] = np.floor(np.log(data[nonzero]) /
+                                 np.log(base)).astype(int)
+
+    # The logarithm may be off by one close to powers of the base, so check
+    # the scaled value and rescale by one place if needed.
+    lead = _scaledlead(data, exponent, base)
+    lead = np.where(nonzero & (lead < 1),
+                    _scaledlead(data, exponent - 1, base),
+                    lead)
+    lead = np.where(lead >= base, _scaledlead(data, exponent + 1, base), lead)
+
+    return lead
+
+
+def _scaledlead(data, exponent, base):
+    """
+    Divide numbers by powers of the base and take the integer part. Powers
+    with exponents of either sign are exact integers as floats, so only one
+    rounding is made, and the result is rounded to about 15 significant
+    digits before the floor.
+
+    :param data: Numpy array of absolute values.
+    :param exponent: Numpy int array of exponents.
+    :param base: Integer base.
+
+    :return: Numpy int array.
+    """
+
+    lead = np.where(exponent >= 0,
+                    data / float(base) ** np.maximum(exponent, 0),
+                    data * float(base) ** np.maximum(-exponent, 0))
+
+    return np.floor(np.round(lead, 15 - len(str(base)))).astype(np.int64)
+
+
+def digitcounts(data, base=10):
+    """
+    Count the first digits of the data in a base, leaving out zeros.
+
+    :param data: Numpy array of numbers.
+    :param base: Integer base, at least 2.
+
+    :return: Numpy array of the counts of first digits 0 to base - 1, with
+    the count of 0 set to 0.
+    """
+
+    counts = np.bincount(firstdigits(data, base), minlength=base)[:base]
+    counts[0] = 0
+
+    return counts
+
+
+@lru_cache(maxsize=None)
+def benfordpdf(base=10):
+    """
+    Benford's law probabilities of the first digits in a base.
+
+    :param base: Integer base, at least 2.
+
+    :return: Read-only numpy array of probabilities of digits 1 to base - 1.
+    """
+
+    digits = np.arange(1, base)
+    pdf = np.log1p(1 / digits) / np.log(base)
+    pdf.setflags(write=False)
+
+    return pdf
+
+
+def _generalized(alpha, base):
+    """
+    Generalized Benford probabilities for an array of alpha.
+
+    :param alpha: Numpy array of alpha.
+    :param base: Integer base.
+
+    :return: Numpy array of shape alpha.shape + (base - 1,).
+    """
+
+    alpha = np.asarray(alpha, dtype=float)[..., np.newaxis]
+    digits = np.arange(1, base)
+
+    # Written with expm1 so that it is accurate near alpha = 1, where it tends
+    # to Benford's law.
+    beta = 1 - alpha
+    near = np.abs(beta) < 1e-8
+    beta = np.where(near, 1e-8, beta)
+
+    numerator = (np.expm1(beta * np.log(digits + 1)) -
+                 np.expm1(beta * np.log(digits)))
+    denominator = np.expm1(beta * np.log(base))
+
+    return np.where(near, benfordpdf(base), numerator / denominator)
+
+
+@lru_cache(maxsize=1024)
+def generalizedpdf(alpha, base=10):
+    """
+    Generalized Benford probabilities of the first digits in a base.
+
+    :param alpha: Exponent of the power law density.
+    :param base: Integer base, at least 2.
+
+    :return: Read-only numpy array of probabilities of digits 1 to base - 1.
+    """
+
+    pdf = _generalized(alpha, base)
+    pdf.setflags(write=False)
+
+    return pdf
+
+
+def loglikelihood(counts, alpha, base=10):
+    """
+    Log-likelihood of histograms of first digits under the generalized
+    Benford law.
+
+    :param counts: Numpy array of shape (..., base) of counts of first
+    digits 0 to base - 1; the count of 0 is not used.
+    :param alpha: Numpy array of alpha, broadcastable to counts.shape[:-1].
+    :param base: Integer base.
+
+    :return: Numpy array of log-likelihoods.
+    """
+
+    counts = np.asarray(counts, dtype=float)[..., 1:]
+
+    return np.sum(counts * np.log(_generalized(alpha, base)), axis=-1)
+
+
+def fit(counts, base=10, bounds=(-4.0, 6.0), gridsize=201, iterations=40):
+    """
+    Fit alpha of the generalized Benford law to histograms of first digits by
+    maximum likelihood. A grid search over bounds brackets the maximum of
+    each histogram, which is then refined by golden section search, all
+    histograms at once.
+
+    :param counts: Numpy array of shape (base,) or (groups, base) of counts
+    of first digits 0 to base - 1.
+    :param base: Integer base.
+    :param bounds: Range of alpha searched.
+    :param gridsize: Number of grid points of the search.
+    :param iterations: Number of golden section steps.
+
+    :return: Fitted alpha, or numpy array of alpha of each histogram.
+    """
+
+    counts = np.asarray(counts, dtype=float)
+    single = counts.ndim == 1
+    counts = np.atleast_2d(counts)
+
+    # Grid search, as a matrix product of counts and log probabilities.
+    grid = np.linspace(bounds[0], bounds[1], gridsize)
+    logpdf = np.log(_generalized(grid, base))
+    best = np.argmax(counts[:, 1:] @ logpdf.T, axis=1)
+
+    step = grid[1] - grid[0]
+    lower = np.maximum(grid[best] - step, bounds[0])
+    upper = np.minimum(grid[best] + step, bounds[1])
+
+    # Golden section search within each bracket.
+    ratio = (np.sqrt(5) - 1) / 2
+    for _ in range(iterations):
+        left = upper - ratio * (upper - lower)
+        right = lower + ratio * (upper - lower)
+        better = (loglikelihood(counts, left, base) >
+                  loglikelihood(counts, right, base))
+        upper = np.where(better, right, upper)
+        lower = np.where(better, lower, left)
+
+    alpha = (lower + upper) / 2
+
+    return alpha[0] if single else alpha
+
+
+def statistics(counts, expected):
+    """
+    Calculate the Kuiper V, Kolmogorov-Smirnov D, m and d test values of
+    histograms of first digits against expected distributions, as
+    numerics.statistic does against Benford's law in base 10.
+
+    :param counts: Numpy array of shape (..., base) of counts of first
+    digits 0 to base - 1; the count of 0 is not used.
+    :param expected: Numpy array of shape (..., base - 1) of expected
+    probabilities of digits 1 to base - 1, broadcastable to counts.
+
+    :return: Dictionary with keys of test type (Kuiper, KS, m and d) and
+    values of numpy arrays of test values.
+    """
+
+    counts = np.asarray(counts, dtype=float)[..., 1:]
+    expected = np.asarray(expected, dtype=float)
+
+    N = counts.sum(axis=-1)
+    pdf = counts / N[..., np.newaxis]
+    pdf, expected = np.broadcast_arrays(pdf, expected)
+
+    cdf = np.cumsum(pdf, axis=-1)
+    expectedcdf = np.cumsum(expected, axis=-1)
+
+    maxdigit = np.argmax(pdf, axis=-1)[..., np.newaxis]
+    deviation = (np.take_along_axis(pdf, maxdigit, axis=-1) -
+                 np.take_along_axis(expected, maxdigit, axis=-1))[..., 0]
+
+    return {"Kuiper": (np.abs(np.max(expectedcdf - cdf, axis=-1)) +
+                       np.abs(np.max(cdf - expectedcdf, axis=-1))),
+            "KS": (pdf.shape[-1] ** (1 / 2) *
+                   np.max(np.abs(expectedcdf - cdf), axis=-1)),
+            "m": N ** (1 / 2) * np.abs(deviation),
+            "d": (N * np.sum((pdf - expected) ** 2, axis=-1)) ** (1 / 2)
+            }
+
+
+def screen(counts, models, base=10):
+    """
+    Compare histograms of first digits against several reference
+    distributions in one pass.
+
+    :param counts: Numpy array of shape (base,) or (groups, base) of counts
+    of first digits 0 to base - 1.
+    :param models: Dictionary with keys of model name and values of expected
+    probabilities of digits 1 to base - 1, e.g. {"Benford": benfordpdf(),
+    "alpha=0.8": generalizedpdf(0.8)}. The value "fit" stands for the
+    generalized Benford law fitted to each histogram.
+    :param base: Integer base.
+
+    :return: Dictionary with keys of model name and values of dictionaries of
+    test values, as from statistics, plus "alpha" for the fitted model.
+    """
+
+    counts = np.asarray(counts, dtype=float)
+
+    names = [name for name, model in models.items()
+             if not isinstance(model, str)]
+    expected = np.stack([models[name] for name in names]) if names \
+        else np.zeros((0, base - 1))
+
+    # Broadcast histograms (..., 1, base) against models (models, base - 1).
+    values = statistics(counts[..., np.newaxis, :], expected)
+
+    screened = {name: {testtype: value[..., idx]
+                       for testtype, value in values.items()}
+                for idx, name in enumerate(names)}
+
+    for name, model in models.items():
+        if isinstance(model, str):
+            if model != "fit":
+                raise ValueError("Unknown model {}.".format(model))
+            alpha = fit(counts, base)
+            screened[name] = statistics(counts, _generalized(alpha, base))
+            screened[name]["alpha"] = alpha
+
+    return screened
@@ -3,7 +3,6 @@ This contains functions to perform some important numerical work.
 """
 
 import numpy as np
-import matplotlib.pyplot as mptlib
 
 
 class benfords:
@@ -96,6 +95,118 @@ def digitn(n, number):
     return n
 
 
+def leadingdigits(data, n=1):
+    """
+    Returns the number formed by the n most significant digits of each input
+    number, e.g. inputs of n=2, data=[38492, 0.0471] return [38, 47]. Zeros,
+    NaN and infinities return 0.
+
+    :param data: Numpy array of numbers.
+    :param n: Number of significant digits.
+
+    :return: Numpy int array of the leading digits.
+    """
+
+    data = np.absolute(np.asarray(data, dtype=float))
+    data = np.where(np.isfinite(data), data, 0)
+    nonzero = data > 0
+
+    scale = np.zeros(data.shape, dtype=int)
+    scale[nonzero] = n - 1 - np.floor(np.log10(data[nonzero])).astype(int)
+
+    # log10 may be off by one close to powers of ten, so check the scaled
+    # value and rescale by one place if needed.
+    lead = _scaledlead(data, scale, n)
+    low = nonzero & (lead < 10 ** (n - 1))
+    lead = np.where(low, _scaledlead(data, scale + 1, n), lead)
+    lead = np.where(lead >= 10 ** n, _scaledlead(data, scale - 1, n), lead)
+
+    return lead
+
+
+def _scaledlead(data, scale, n):
+    """
+    Scale numbers by powers of ten and take the integer part. Floats hold
+    about 15 significant decimal digits, e.g. 0.29 is stored as
+    0.28999999999999998, so the scaled value is rounded to 15 significant
+    digits before the floor.
+
+    :param data: Numpy array of absolute values.
+    :param scale: Numpy int array of powers of ten to scale by.
+    :param n: Number of digits of the integer part.
+
+    :return: Numpy int array.
+    """
+
+    # Scale by exact powers of ten, multiplying or dividing so that only one
+    # rounding is made.
+    lead = np.where(scale >= 0,
+                    data * 10.0 ** np.maximum(scale, 0),
+                    data / 10.0 ** np.maximum(-scale, 0))
+
+    return np.floor(np.round(lead, max(15 - n, 0))).astype(np.int64)
+
+
+def digitcounts(firstdigits):
+    """
+    Count the first digits, giving the histogram that the tests work on.
+
+    :param firstdigits: Numpy array of first digits, usually passed in using
+    dataset.dataset class. Zeros have first digit 0.
+
+    :return: Numpy array of the counts of first digits 0-9.
+    """
+
+    return np.bincount(firstdigits, minlength=10)[:10]
+
+
+def statistic(testtype, counts):
+    """
+    Calculate the test value from histograms of first digits. Works on a
+    single histogram or a stack of them at once. Zeros, counted as first
+    digit 0, have no first digit under Benford's law and are left out of N,
+    so every source gives the same test value whether or not it counts them.
+
+    :param testtype: String of type of test to perform: Kuiper, KS, m, or d.
+    :param counts: Numpy array of counts of first digits 0-9, of shape (10,)
+    or (..., 10), e.g. from digitcounts.
+
+    :return: Test value, or array of test values of shape (...).
+    """
+
+    benfpdf = benfords().pdf
+    npbenfpdf = np.array([benfpdf[k] for k in [1, 2, 3, 4, 5, 6, 7, 8, 9]])
+    npbenfcdf = np.cumsum(npbenfpdf)
+
+    counts = np.asarray(counts)
+    N = counts[..., 1:].sum(axis=-1)
+
+    pdf = counts[..., 1:] / N[..., np.newaxis]
+    cdf = np.cumsum(pdf, axis=-1)
+
+    if testtype == "Kuiper":
+        Dplus = np.abs(np.max(npbenfcdf - cdf, axis=-1))
+        Dminus = np.abs(np.max(cdf - npbenfcdf, axis=-1))
+
+        return Dplus + Dminus
+
+    elif testtype == "KS":
+        return 3 * np.max(np.abs(npbenfcdf - cdf), axis=-1)  # 3 = sqrt(9)
+
+    elif testtype == "m":
+        maxdigit = np.argmax(pdf, axis=-1)[..., np.newaxis]
+        maxPr = np.take_along_axis(pdf, maxdigit, axis=-1)[..., 0]
+
+        return N ** (1 / 2) * np.abs(maxPr - npbenfpdf[maxdigit[..., 0]])
+
+    elif testtype == "d":
+        summed = np.sum((pdf - npbenfpdf) ** 2, axis=-1)
+
+        return (N * summed) ** (1 / 2)
+
+    raise ValueError("Unknown test type {}.".format(testtype))
+
+
 def test(testtype, firstdigits, plot=False, printsignificance=False):
     """
     Combine all tests into one function. Calculates Benford's law PDF and CDF,
@@ -112,6 +223,27 @@ def test(testtype, firstdigits, plot=False, printsignificance=False):
     :return: Returns test value.
     """
 
+    return histogramtest(testtype,
+                         digitcounts(firstdigits),
+                         plot,
+                         printsignificance
+                         )
+
+
+def histogramtest(testtype, counts, plot=False, printsignificance=False):
+    """
+    As test, but working on the histogram of first digits instead of the
+    first digits themselves, e.g. when counts are merged from several sources.
+
+    :param testtype: String of type of test to perform: Kuiper, KS, m, or d.
+    :param counts: Numpy array of counts of first digits 0-9.
+    :param plot: Boolean of whether to plot PDF result.
+    :param printsignificance: Boolean of whether to print significance test
+    results to output.
+
+    :return: Returns test value.
+    """
+
     testvar = {"Kuiper": "V",
                "KS": "D",
                "m": "m",
@@ -124,59 +256,17 @@ def test(testtype, firstdigits, plot=False, printsignificance=False):
                 "d": "Cho-Gaines\'"
                 }
 
-    # Calculate Benford's law PDF ##############################################
-    benfpdf = benfords().pdf
-    npbenfpdf = np.array([benfpdf[k] for k in [1, 2, 3, 4, 5, 6, 7, 8, 9]])
-
-    # Calculate Benford's law CDF ##############################################
-    benfcdf = benfords().cdf
-    npbenfcdf = np.array([benfcdf[k] for k in [1, 2, 3, 4, 5, 6, 7, 8, 9]])
-
-    # Calculate input firstdigits PDF ##########################################
-    firstdigitsN = firstdigits.size
-
-    firstdigitspdf = np.bincount(firstdigits)
-    firstdigitspdf = list(firstdigitspdf[1:] / firstdigitsN)
-
-    # Calculate input firstdigits CDF ##########################################
-    firstdigitscdf = []
-    for k in [1, 2, 3, 4, 5, 6, 7, 8, 9]:
-        firstdigitscdf += [sum(firstdigitspdf[0:k])]
-
     # Calculate test value #####################################################
-    if testtype == "Kuiper":
-        Dplus = np.abs(np.max(np.subtract(npbenfcdf, firstdigitscdf)))
-        Dminus = np.abs(np.max(np.subtract(firstdigitscdf, npbenfcdf)))
-
-        V = Dplus + Dminus
-        testvalue = V
-
-    elif testtype == "KS":
-        D = np.max(np.abs(np.subtract(npbenfcdf, firstdigitscdf)))
-        D *= 3  # = sqrt(9)
-        testvalue = D
-
-    elif testtype == "m":
-        maxPr = 0
-
-        for idx, Pr in enumerate(firstdigitspdf):
-            if Pr > maxPr:
-                maxPr = Pr
-                maxdigit = idx + 1
-
-        m = firstdigitsN ** (1 / 2) * abs(maxPr - benfpdf[maxdigit])
-        testvalue = m
-
-    elif testtype == "d":
-        summed = 0
-        for idx, Pr in enumerate(firstdigitspdf):
-            summed += (Pr - benfpdf[idx + 1]) ** 2
-
-        d = (firstdigitsN * summed) ** (1 / 2)
-        testvalue = d
+    testvalue = statistic(testtype, counts)
 
     # Plot results #############################################################
     if plot is True:
+        import matplotlib.pyplot as mptlib
+
+        benfpdf = benfords().pdf
+        npbenfpdf = np.array([benfpdf[k] for k in [1, 2, 3, 4, 5, 6, 7, 8, 9]])
+        firstdigitspdf = np.asarray(counts)[1:] / np.sum(counts[1:])
+
         mptlib.plot([1, 2, 3, 4, 5, 6, 7, 8, 9],
                     npbenfpdf,
                     'b-',
@@ -209,6 +299,86 @@ def test(testtype, firstdigits, plot=False, printsignificance=False):
     return testvalue
 
 
+def _bootstrapbatch(counts, replicates, seed):
+    """
+    Resample a histogram of first digits and calculate every test value of
+    each replicate.
+
+    :param counts: Numpy array of counts of first digits 0-9.
+    :param replicates: Number of replicates in this batch.
+    :param seed: numpy SeedSequence of this batch.
+
+    :return: Numpy array of shape (replicates, 4) of Kuiper, KS, m and d test
+    values.
+    """
+
+    rng = np.random.default_rng(seed)
+    N = int(np.sum(counts))
+
+    samples = rng.multinomial(N, counts / N, size=replicates)
+
+    return np.stack([statistic(testtype, samples)
+                     for testtype in ["Kuiper", "KS", "m", "d"]], axis=-1)
+
+
+def bootstrap(counts,
+              replicates=10000,
+              alpha=0.05,
+              seed=None,
+              batchsize=5000,
+              processes=1
+              ):
+    """
+    Calculate bootstrap confidence intervals of the test values. The
+    histogram of first digits is resampled multinomially, so the cost depends
+    on the number of replicates and not on the number of data. Replicates are
+    drawn in batches, each with its own seed spawned from seed, so results
+    are identical for any number of processes.
+
+    :param counts: Numpy array of counts of first digits 0-9, e.g. from
+    digitcounts.
+    :param replicates: Number of bootstrap replicates.
+    :param alpha: Confidence intervals are at the 1 - alpha level.
+    :param seed: Integer seed for reproducible results; default is None.
+    :param batchsize: Number of replicates resampled at once.
+    :param processes: Number of worker processes; default is 1, which runs
+    in this process.
+
+    :return: Dictionary with keys of test type (Kuiper, KS, m and d) and
+    values of (lower, upper) bounds of the confidence interval.
+    """
+
+    counts = np.asarray(counts, dtype=float).copy()
+    counts[0] = 0  # Zeros are left out, as in statistic.
+    if counts.sum() == 0:
+        raise ValueError("Histogram of first digits is empty.")
+
+    sizes = [batchsize] * (replicates // batchsize)
+    if replicates % batchsize:
+        sizes += [replicates % batchsize]
+
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+
+    if processes > 1:
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            batches = list(executor.map(_bootstrapbatch,
+                                        [counts] * len(sizes),
+                                        sizes,
+                                        seeds
+                                        ))
+    else:
+        batches = [_bootstrapbatch(counts, size, batchseed)
+                   for size, batchseed in zip(sizes, seeds)]
+
+    values = np.concatenate(batches)
+    bounds = np.quantile(values, [alpha / 2, 1 - alpha / 2], axis=0)
+
+    return {testtype: (float(bounds[0, idx]), float(bounds[1, idx]))
+            for idx, testtype in enumerate(["Kuiper", "KS", "m", "d"])}
+
+
 def testsig(testtype, testvalue):
     """
     Tests whether test value is significant. Returns a dictionary with keys
@@ -0,0 +1,300 @@
+"""
+This holds the results of many analyses, e.g. one per group, compactly.
+
+Results are kept as one structured numpy array with a record per group of
+its number of data N, the Kuiper V, Kolmogorov-Smirnov D, m and d test values
+and the significance of each test at each alpha as bit flags, instead of a
+Python dictionary per result. Group keys are kept once, in an array indexed
+by the group field. Tables can be filtered, ranked, saved to and loaded from
+.npz files, and merged from parallel workers.
+"""
+
+import numpy as np
+
+import benfordspy.numerics as numerics
+
+
+TESTS = ["Kuiper", "KS", "m", "d"]
+TESTVARS = ["V", "D", "m", "d"]
+ALPHAS = [0.10, 0.05, 0.01]
+
+RESULTDTYPE = np.dtype([("group", np.int64),
+                        ("N", np.int64),
+                        ("V", np.float64),
+                        ("D", np.float64),
+                        ("m", np.float64),
+                        ("d", np.float64),
+                        ("significance", np.uint16)
+                        ])
+
+
+def significancebit(testtype, alpha):
+    """
+    Return the bit flag of the significance of a test at an alpha.
+
+    :param testtype: Test type: Kuiper, KS, m, or d.
+    :param alpha: Significance level: 0.10, 0.05 or 0.01.
+
+    :return: Integer bit flag.
+    """
+
+    return 1 << (3 * TESTS.index(testtype) + ALPHAS.index(alpha))
+
+
+class Result:
+
+    """
+    A single result, e.g. a record of a ResultTable.
+    """
+
+    __slots__ = ("group", "N", "V", "D", "m", "d", "significance")
+
+    def __init__(self, group, N, V, D, m, d, significance):
+        self.group = group
+        self.N = N
+        self.V = V
+        self.D = D
+        self.m = m
+        self.d = d
+        self.significance = significance
+
+    def __repr__(self):
+        return ("Result(group={!r}, N={}, V={:.4f}, D={:.4f}, m={:.4f}, "
+                "d={:.4f})".format(self.group, self.N, self.V, self.D,
+                                   self.m, self.d))
+
+    def significant(self, testtype, alpha=0.05):
+        """
+        Return whether a test value is significant.
+
+        :param testtype: Test type: Kuiper, KS, m, or d.
+        :param alpha: Significance level: 0.10, 0.05 or 0.01.
+
+        :return: True if significant.
+        """
+
+        return bool(self.significance & significancebit(testtype, alpha))
+
+
+class ResultTable:
+
+    """
+    Table of results, one record per group.
+
+    :param records: Structured numpy array of RESULTDTYPE.
+    :param keys: 1-D numpy array of group keys, indexed by the group field;
+    default is None, which numbers the groups.
+    """
+
+    def __init__(self, records, keys=None):
+        self.records = np.asarray(records, dtype=RESULTDTYPE)
+
+        if keys is None:
+            keys = np.arange(self.records["group"].max() + 1
+                             if len(self.records) else 0)
+        self.keys = _keyarray(keys)
+
+    @classmethod
+    def fromcounts(cls, counts, keys=None):
+        """
+        Calculate every test value of each histogram of first digits.
+
+        :param counts: Numpy array of shape (groups, 10) of counts of first
+        digits 0-9.
+        :param keys: Group keys, one per histogram; default is None.
+
+        :return: ResultTable.
+        """
+
+        counts = np.atleast_2d(counts)
+
+        records = np.zeros(len(counts), dtype=RESULTDTYPE)
+        records["group"] = np.arange(len(counts))
+        records["N"] = counts[:, 1:].sum(axis=1)
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            for testtype, testvar in zip(TESTS, TESTVARS):
+                values = numerics.statistic(testtype, counts)
+                records[testvar] = values
+
+                for alpha, significant in numerics.testsig(testtype,
+                                                           values).items():
+                    records["significance"] |= np.where(
+                        significant,
+                        significancebit(testtype, alpha),
+                        0).astype(np.uint16)
+
+        return cls(records, keys)
+
+    def __len__(self):
+        return len(self.records)
+
+    def __getitem__(self, idx):
+        record = self.records[idx]
+
+        key = self.keys[record["group"]]
+        if isinstance(key, np.generic):
+            key = key.item()
+
+        return Result(key,
+                      int(record["N"]),
+                      float(record["V"]),
+                      float(record["D"]),
+                      float(record["m"]),
+                      float(record["d"]),
+                      int(record["significance"]))
+
+    def __iter__(self):
+        for idx in range(len(self)):
+            yield self[idx]
+
+    def groupkeys(self):
+        """
+        Return the group key of each record.
+
+        :return: 1-D numpy array of keys.
+        """
+
+        return self.keys[self.records["group"]]
+
+    def get(self, key):
+        """
+        Return the result of a group.
+
+        :param key: Group key.
+
+        :return: Result, or None if there is no such group.
+        """
+
+        groupkeys = self.groupkeys()
+        if groupkeys.dtype == object:
+            matches = [idx for idx, groupkey in enumerate(groupkeys)
+                       if groupkey == key]
+        else:
+            matches = np.flatnonzero(groupkeys == key)
+
+        return self[matches[0]] if len(matches) else None
+
+    def significant(self, testtype, alpha=0.05):
+        """
+        Return a mask of the records whose test value is significant.
+
+        :param testtype: Test type: Kuiper, KS, m, or d.
+        :param alpha: Significance level: 0.10, 0.05 or 0.01.
+
+        :return: 1-D numpy bool array.
+        """
+
+        return (self.records["significance"] &
+                significancebit(testtype, alpha)) != 0
+
+    def filter(self, mask):
+        """
+        Return the records selected by a mask, e.g.
+        table.filter(table.records["N"] > 1000).
+
+        :param mask: 1-D numpy bool array, or array of record indices.
+
+        :return: ResultTable sharing the group keys.
+        """
+
+        return ResultTable(self.records[mask], self.keys)
+
+    def rank(self, testvar, k=None, descending=True):
+        """
+        Return the records ordered by a test value, e.g. the k groups that
+        deviate most from Benford's law. Records without a test value (NaN),
+        e.g. of groups without data, come last.
+
+        :param testvar: Field to order by: V, D, m, d or N.
+        :param k: Number of records to return; default is None, for all.
+        :param descending: Flag to order from largest; default is True.
+
+        :return: ResultTable sharing the group keys.
+        """
+
+        values = self.records[testvar]
+
+        # NaN, e.g. of groups without data, sorts last in both directions.
+        order = np.argsort(-values if descending else values, kind='stable')
+
+        return self.filter(order[:k])
+
+    def save(self, file):
+        """
+        Save the table to a .npz file.
+
+        :param file: File name.
+
+        :return: Nothing.
+        """
+
+        np.savez(file, records=self.records, keys=self.keys)
+
+    @classmethod
+    def load(cls, file):
+        """
+        Load a table saved by save. Group keys that are not numbers or
+        strings are unpickled, so only load trusted files.
+
+        :param file: File name.
+
+        :return: ResultTable.
+        """
+
+        with np.load(file, allow_pickle=True) as saved:
+            return cls(saved["records"], saved["keys"])
+
+    @classmethod
+    def merge(cls, tables):
+        """
+        Merge tables, e.g. from parallel workers, renumbering their groups.
+
+        :param tables: List of ResultTable.
+
+        :return: ResultTable.
+        """
+
+        records = []
+        keys = []
+        offset = 0
+        for table in tables:
+            merged = table.records.copy()
+            merged["group"] += offset
+            records += [merged]
+            keys += [table.keys]
+            offset += len(table.keys)
+
+        if not records:
+            return cls(np.zeros(0, dtype=RESULTDTYPE))
+
+        if len({key.dtype for key in keys}) > 1:
+            # Keep keys of different types as they are, e.g. 7 and "x",
+            # rather than converting them to a common type.
+            keys = [key.astype(object) for key in keys]
+
+        return cls(np.concatenate(records), np.concatenate(keys))
+
+
+def _keyarray(keys):
+    """
+    Convert group keys to a 1-D numpy array, of objects if they are not all
+    numbers or all strings (e.g. tuples of several key columns).
+
+    :return: 1-D numpy array.
+    """
+
+    if isinstance(keys, np.ndarray) and keys.ndim == 1:
+        return keys
+
+    keys = list(keys)
+    try:
+        array = np.asarray(keys) if keys else np.zeros(0, dtype=np.int64)
+    except ValueError:
+        array = None
+
+    if array is None or array.ndim != 1 or array.dtype.kind not in 'biufU':
+        array = np.empty(len(keys), dtype=object)
+        array[:] = keys
+
+    return array
@@ -0,0 +1,388 @@
+"""
+This runs Benford's law analyses as a long-running local service.
+
+Requests are JSON objects, one per line, over a TCP connection, e.g.
+
+    {"id": 1, "testtype": "KS", "values": [1.5, 23, 310]}
+    {"id": 2, "testtype": "d", "file": "data.xlsx", "source": "excel",
+     "filters": {"WorkSheets": {"include": ["Sheet1"]},
+                 "RowLabels": {"defaultinclude": true},
+                 "ColLabels": {"defaultinclude": true}}}
+
+and each gets one JSON line in reply with its id, the test value and its
+significance, or an error. Sources are "excel", "csv" and "text"; filters
+take the fields of filters.ExcelFilter or filters.CSVFilter.
+
+Parsing and digit extraction run in a pool of worker processes that have
+imported numpy, openpyxl and benfordspy once at start. First digit counts are
+kept in an LRU cache keyed by a hash of the content and the filters, so
+re-submitted values or unchanged files are not parsed again. Each connection
+is served one request at a time and at most maxpending requests are parsed at
+once, so clients that send faster than the workers keep up are held back by
+TCP flow control. Request lines longer than linelimit bytes are answered with
+an error and skipped.
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+import benfordspy.numerics as numerics
+from benfordspy.filters import ExcelFilter, CSVFilter, Rule
+
+
+def _warm():
+    """
+    Import the modules used by the workers, once per worker process.
+
+    :return: Nothing.
+    """
+
+    import openpyxl  # noqa: F401
+    import benfordspy.dataset  # noqa: F401
+    import benfordspy.excel  # noqa: F401
+    import benfordspy.csv  # noqa: F401
+    import benfordspy.textdigits  # noqa: F401
+
+
+def specfrom(source, filters):
+    """
+    Build a filter specification from the filters of a request.
+
+    :param source: Source type: "excel" or "csv".
+    :param filters: Dictionary with keys of filter names (e.g. "RowLabels")
+    and values of dictionaries with include, exclude and defaultinclude.
+
+    :return: filters.ExcelFilter or filters.CSVFilter.
+    """
+
+    spec = ExcelFilter() if source == "excel" else CSVFilter()
+
+    for name, rule in (filters or {}).items():
+        if name not in spec._fields:
+            raise ValueError("Unknown filter {}.".format(name))
+
+        include = rule.get("include")
+        exclude = rule.get("exclude")
+        if name == "CellRange":
+            # JSON has no tuples; ranges given as lists are made hashable.
+            include = [tuple(rng) if isinstance(rng, list) else rng
+                       for rng in include or ()]
+            exclude = [tuple(rng) if isinstance(rng, list) else rng
+                       for rng in exclude or ()]
+
+        spec = spec._replace(**{name: Rule(include,
+                                           exclude,
+                                           rule.get("defaultinclude",
+                                                    name == "CellRange"))})
+
+    return spec
+
+
+def sourcekey(request):
+    """
+    Hash the content and filters of a request, to key the cache.
+
+    :param request: Request dictionary.
+
+    :return: Hex digest string.
+    """
+
+    digest = hashlib.sha256()
+
+    if "values" in request:
+        digest.update(b'values')
+        digest.update(np.asarray(request["values"], dtype=float).tobytes())
+    else:
+        digest.update(request.get("source", "").encode())
+        digest.update(json.dumps(request.get("filters"),
+                                 sort_keys=True).encode())
+        with open(request["file"], 'rb') as fh:
+            for block in iter(lambda: fh.read(2 ** 20), b''):
+                digest.update(block)
+
+    return digest.hexdigest()
+
+
+def sourcecounts(request):
+    """
+    Extract the first digit counts of the source of a request. Runs in the
+    worker processes.
+
+    :param request: Request dictionary.
+
+    :return: Numpy array of the counts of first digits 0-9.
+    """
+
+    import benfordspy.dataset as dataset
+
+    if "values" in request:
+        numbers = [float(value) for value in request["values"]]
+
+    elif request.get("source") == "excel":
+        from benfordspy.excel import ExcelDB
+        spec = specfrom("excel", request.get("filters"))
+        numbers = ExcelDB(request["file"]).extractnumbers(spec)
+
+    elif request.get("source") == "csv":
+        from benfordspy.csv import CSVDB
+        spec = specfrom("csv", request.get("filters"))
+        numbers = CSVDB(request["file"]).extractnumbers(spec)
+
+    elif request.get("source") == "text":
+        import benfordspy.textdigits as textdigits
+        counts = numerics.digitcounts(textdigits.scanfile(request["file"])[0])
+        counts[0] = 0
+
+        return counts
+
+    else:
+        raise ValueError("Unknown source {}.".format(request.get("source")))
+
+    data = dataset.dataset()
+    data.datainit(numbers)
+    data.updatefirstdigits()
+
+    return numerics.digitcounts(data.firstdigits)
+
+
+class BenfordsService:
+
+    """
+    Local asyncio service scoring values and files on demand.
+
+    :param processes: Number of warm worker processes; default is None, which
+    uses the number of CPUs.
+    :param cachesize: Number of sources kept in the LRU cache.
+    :param maxpending: Maximum number of sources parsed at once.
+    :param linelimit: Maximum length of a request line in bytes; default is
+    16 MiB, about 800,000 values.
+    """
+
+    def __init__(self, processes=None, cachesize=128, maxpending=16,
+                 linelimit=2 ** 24):
+        self.processes = processes
+        self.cachesize = cachesize
+        self.linelimit = linelimit
+        self.cache = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.pending = asyncio.Semaphore(maxpending)
+        self.executor = None
+        self.server = None
+        self.port = None
+
+    async def start(self, host='127.0.0.1', port=0):
+        """
+        Start the worker processes and listen for connections.
+
+        :param host: Address to listen on; default is localhost only.
+        :param port: Port to listen on; default of 0 picks a free port,
+        available afterwards as self.port.
+
+        :return: Nothing.
+        """
+
+        loop = asyncio.get_running_loop()
+
+        processes = self.processes or os.cpu_count() or 1
+        self.executor = ProcessPoolExecutor(max_workers=processes,
+                                            initializer=_warm)
+        # Start every worker now so that no request waits for the imports.
+        await asyncio.gather(*(loop.run_in_executor(self.executor, _warm)
+                               for _ in range(processes)))
+
+        self.server = await asyncio.start_server(self.handle,
+                                                 host,
+                                                 port,
+                                                 limit=self.linelimit)
+        self.port = self.server.sockets[0].getsockname()[1]
+
+    async def close(self):
+        """
+        Stop listening and shut down the worker processes.
+
+        :return: Nothing.
+        """
+
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+            self.server = None
+
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
+
+    async def counts(self, request):
+        """
+        Return the first digit counts of the source of a request, from the
+        cache if present there.
+
+        :param request: Request dictionary.
+
+        :return: Numpy array of the counts of first digits 0-9.
+        """
+
+        loop = asyncio.get_running_loop()
+
+        async with self.pending:
+            key = await loop.run_in_executor(None, sourcekey, request)
+
+            if key in self.cache:
+                self.hits += 1
+                self.cache.move_to_end(key)
+                return self.cache[key]
+
+            self.misses += 1
+            counts = await loop.run_in_executor(self.executor,
+                                                sourcecounts,
+                                                request)
+
+        self.cache[key] = counts
+        if len(self.cache) > self.cachesize:
+            self.cache.popitem(last=False)
+
+        return counts
+
+    async def score(self, request):
+        """
+        Score one request.
+
+        :param request: Request dictionary.
+
+        :return: Response dictionary with id, testvalue and significance, or
+        id and error.
+        """
+
+        response = {"id": request.get("id")}
+
+        try:
+            testtype = request.get("testtype", "KS")
+            counts = await self.counts(request)
+            if np.sum(counts[1:]) == 0:
+                raise IOError("Loaded no data")
+
+            testvalue = float(numerics.statistic(testtype, counts))
+            significance = numerics.testsig(testtype, testvalue)
+
+            response["testvalue"] = testvalue
+            response["significance"] = {str(alpha): bool(significant)
+                                        for alpha, significant
+                                        in significance.items()}
+        except Exception as error:
+            response["error"] = "{}: {}".format(type(error).__name__, error)
+
+        return response
+
+    async def handle(self, reader, writer):
+        """
+        Serve one connection, reading one JSON request per line.
+
+        :return: Nothing.
+        """
+
+        try:
+            while True:
+                try:
+                    line = await reader.readuntil(b'\n')
+                except asyncio.IncompleteReadError as error:
+                    line = error.partial  # Last line, without newline.
+                except asyncio.LimitOverrunError as error:
+                    if not await _skipline(reader, error.consumed):
+                        break
+                    response = {"id": None,
+                                "error": "Request longer than {} bytes."
+                                         .format(self.linelimit)}
+                    writer.write(json.dumps(response).encode() + b'\n')
+                    await writer.drain()
+                    continue
+
+                if not line:
+                    break
+
+                try:
+                    request = json.loads(line)
+                except ValueError as error:
+                    response = {"id": None, "error": str(error)}
+                else:
+                    response = await self.score(request)
+
+                writer.write(json.dumps(response).encode() + b'\n')
+                await writer.drain()
+        finally:
+            writer.close()
+
+
+async def _skipline(reader, consumed):
+    """
+    Discard the rest of a request line that overran the stream limit.
+
+    :param reader: asyncio StreamReader.
+    :param consumed: Number of bytes that can be discarded at once, from the
+    LimitOverrunError.
+
+    :return: True if the line was discarded, False if the connection closed
+    first.
+    """
+
+    try:
+        while True:
+            await reader.readexactly(consumed)
+            try:
+                await reader.readuntil(b'\n')
+                return True
+            except asyncio.LimitOverrunError as error:
+                consumed = error.consumed
+    except asyncio.IncompleteReadError:
+        return False
+
+
+async def request(message, host='127.0.0.1', port=None):
+    """
+    Send one request to a running service and wait for its reply.
+
+    :param message: Request dictionary.
+    :param host: Address of the service.
+    :param port: Port of the service.
+
+    :return: Response dictionary.
+    """
+
+    reader, writer = await asyncio.open_connection(host, port)
+
+    try:
+        writer.write(json.dumps(message).encode() + b'\n')
+        await writer.drain()
+
+        return json.loads(await reader.readline())
+    finally:
+        writer.close()
+
+
+def serve(host='127.0.0.1', port=8765, processes=None, cachesize=128,
+          maxpending=16, linelimit=2 ** 24):
+    """
+    Run the service until interrupted.
+
+    :return: Nothing.
+    """
+
+    async def main():
+        service = BenfordsService(processes, cachesize, maxpending, linelimit)
+        await service.start(host, port)
+        try:
+            await service.server.serve_forever()
+        finally:
+            await service.close()
+
+    asyncio.run(main())
+
+
+if __name__ == '__main__':
+    serve()
@@ -14,5 +14,8 @@ setup(name="benfordspy",
           'numpy',
           'openpyxl'
       ],
+      extras_require={
+          'frames': ['pandas', 'pyarrow']
+      },
       test_suite='alltests.py'
       )
\ No newline at end of file
@@ -0,0 +1,165 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+from benfordspy.csv import (CSVDB, byteranges, parallelcounts, _countlines,
+                            _rangecounts)
+from benfordspy.filters import CSVFilter, Rule
+import benfordspy.numerics as numerics
+from benfordspy.BenfordsPy import BenfordsPy
+
+
+class TestParallelCSV(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.filename = os.path.join(self.tmpdir, 'test.csv')
+
+        rng = np.random.default_rng(0)
+        self.values = np.round(np.exp(rng.uniform(0, 10, (400, 5))), 2)
+        np.savetxt(self.filename, self.values, delimiter=',', fmt='%.2f')
+
+        self.spec = CSVFilter(RowNumbers=Rule(defaultinclude=True),
+                              ColNumbers=Rule(defaultinclude=True))
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def firstdigits(self, values):
+        return np.array([numerics.digitn(1, value) for value in values],
+                        dtype=int)
+
+    def test_byteranges(self):
+        ranges = byteranges(self.filename, 7)
+        self.assertEqual(ranges[0][0], 0)
+        self.assertEqual(ranges[-1][1], os.path.getsize(self.filename))
+        with open(self.filename, 'rb') as fh:
+            content = fh.read()
+        for start, end in ranges:
+            self.assertEqual(content[start - 1:start] or b'\n', b'\n')
+
+    def test_parallelcounts(self):
+        counts = parallelcounts(self.filename, processes=2,
+                                spec=self.spec, parts=9)
+        expected = numerics.digitcounts(self.firstdigits(self.values.ravel()))
+        self.assertSequenceEqual(counts.tolist(), expected.tolist())
+
+    def test_countlines(self):
+        with open(self.filename, 'wb') as fh:
+            fh.write(b'1,2\n3\r4,5\n6,7')
+        self.assertEqual(_countlines(self.filename, 0, 14), 3)
+        self.assertEqual(_countlines(self.filename, 4, 10), 1)
+        # A range beyond the end, e.g. of a file that shrank, has no lines.
+        self.assertEqual(_countlines(self.filename, 14, 30), 0)
+
+    def test_rangecountspastend(self):
+        with open(self.filename, 'wb') as fh:
+            fh.write(b'12,0\n5,71')
+        counts = _rangecounts(self.filename, 0, 30, 0, self.spec, b',')
+        self.assertSequenceEqual(counts.tolist(),
+                                 [1, 1, 0, 0, 0, 1, 0, 1, 0, 0])
+
+    def test_parallelcountscarriagereturn(self):
+        with open(self.filename, 'wb') as fh:
+            fh.write(b'1,2\n3\r4,5\n6,7\n8,9\n')
+
+        spec = CSVFilter(RowNumbers=Rule(include={2}),
+                         ColNumbers=Rule(defaultinclude=True))
+        for parts in [1, 2, 3]:
+            counts = parallelcounts(self.filename, processes=1, spec=spec,
+                                    parts=parts)
+            self.assertSequenceEqual(counts.tolist(),
+                                     [0, 0, 0, 0, 0, 0, 1, 1, 0, 0])
+
+    def test_parallelcountsfilter(self):
+        self.spec = CSVFilter(RowNumbers=Rule(exclude=range(50, 300),
+                                              defaultinclude=True),
+                              ColNumbers=Rule(include={1, 3}))
+
+        counts = parallelcounts(self.filename, processes=2,
+                                spec=self.spec, parts=13)
+        rows = [row for row in range(400) if not 50 <= row < 300]
+        expected = numerics.digitcounts(
+            self.firstdigits(self.values[rows][:, [1, 3]].ravel()))
+        self.assertSequenceEqual(counts.tolist(), expected.tolist())
+
+    def test_zeros(self):
+        with open(self.filename, 'w') as fh:
+            fh.write('12,0\n0,340\n5,0\n71,9\n')
+
+        results = []
+        for processes in [None, 2]:
+            test = BenfordsPy()
+            test.analyzeCSV(self.filename, "KS",
+                            rownumincldefault=True,
+                            colnumincldefault=True,
+                            processes=processes)
+            results += [test.result]
+
+        listtest = BenfordsPy()
+        listtest.analyzelist([12.0, 0.0, 0.0, 340.0, 5.0, 0.0, 71.0, 9.0],
+                             "KS")
+
+        self.assertAlmostEqual(results[0], results[1])
+        self.assertAlmostEqual(results[0], listtest.result)
+
+    def test_decimals(self):
+        with open(self.filename, 'w') as fh:
+            fh.write('0.3,0.6,0.7,1.1\n' * 5)
+
+        results = []
+        for processes, drilldown in [(None, False), (2, False),
+                                     (None, True)]:
+            test = BenfordsPy()
+            test.analyzeCSV(self.filename, "KS",
+                            rownumincldefault=True,
+                            colnumincldefault=True,
+                            processes=processes,
+                            drilldown=drilldown)
+            results += [test.result]
+
+        test.analyzetext(self.filename, "KS")
+        results += [test.result]
+
+        for result in results[1:]:
+            self.assertAlmostEqual(result, results[0])
+
+    def test_serialequivalence(self):
+        with open(self.filename, 'w') as fh:
+            fh.write('a,b\n11,21\n\n31,41\n# note, 99\n"81",52\n'
+                     '  \n61,71 # 98\n7e2,.5\n')
+
+        db = CSVDB(self.filename)
+        for rows in [{2}, {3, 4}, {1, 5}]:
+            for parts in [1, 2, 4]:
+                spec = CSVFilter(RowNumbers=Rule(include=rows),
+                                 ColNumbers=Rule(defaultinclude=True))
+                expected = numerics.digitcounts(numerics.leadingdigits(
+                    db.extractnumbers(spec)))
+                counts = parallelcounts(self.filename, processes=2,
+                                        spec=spec, parts=parts)
+                self.assertSequenceEqual(counts.tolist(), expected.tolist())
+
+        expected = numerics.digitcounts(numerics.leadingdigits(
+            db.extractnumbers(self.spec)))
+        counts = parallelcounts(self.filename, processes=2, spec=self.spec,
+                                parts=3)
+        self.assertSequenceEqual(counts.tolist(), expected.tolist())
+
+    def test_cachemode(self):
+        cache = {}
+        for processes in [2, None]:
+            test = BenfordsPy(cache)
+            test.analyzeCSV(self.filename, "KS",
+                            rownumincldefault=True,
+                            colnumincldefault=True,
+                            processes=processes)
+        self.assertEqual(len(cache), 2)
+        self.assertEqual({key[-1] for key in cache}, {"parallel", None})
+
+
+if __name__ == '__main__':
+    unittest.main()
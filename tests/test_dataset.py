@@ -13,6 +13,12 @@ class TestDataset(unittest.TestCase):
                                  np.array([1, 2, 5, 6, 3], dtype=int).tolist()
                                  )
 
+    def test_decimalfirstdigits(self):
+        d = dataset.dataset()
+        d.datainit([0.3, 0.6, 0.7, 1.1, 0, 0.29])
+        d.updatefirstdigits()
+        self.assertSequenceEqual(d.firstdigits.tolist(), [3, 6, 7, 1, 0, 2])
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,93 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+from openpyxl import Workbook
+
+import benfordspy.BenfordsPy as BP
+from benfordspy.drilldown import *
+
+
+class TestDrillDown(unittest.TestCase):
+
+    def test_digitindex(self):
+        index = DigitIndex([3, 1, 3, 0, 1, 3], 4)
+        self.assertSequenceEqual(index.indptr.tolist(), [0, 1, 3, 3, 6])
+        self.assertSequenceEqual(index.positions(3).tolist(), [0, 2, 5])
+        self.assertSequenceEqual(index.positions(1, 3).tolist(),
+                                 [1, 4, 0, 2, 5])
+        self.assertSequenceEqual(index.counts().tolist(), [1, 2, 0, 3])
+
+    def test_records(self):
+        values = [48.5, 4800, 0.49, 12, 4.8, 0.3]
+        coordinates = {"row": [5, 6, 7, 8, 9, 10], "col": [2, 2, 2, 3, 3, 3]}
+        drill = DrillDown(values, coordinates)
+
+        records = drill.records(48)
+        self.assertSequenceEqual(records["value"].tolist(), [48.5, 4800, 4.8])
+        self.assertSequenceEqual(records["row"].tolist(), [5, 6, 9])
+
+        self.assertSequenceEqual(drill.records(4)["row"].tolist(),
+                                 [5, 6, 9, 7])
+        self.assertSequenceEqual(drill.records(30)["value"].tolist(), [0.3])
+        self.assertSequenceEqual(drill.firstdigits.tolist(),
+                                 [4, 4, 4, 1, 4, 3])
+
+        with self.assertRaises(ValueError):
+            drill.records(480)
+
+    def test_analyzeexcel(self):
+        tmpdir = tempfile.mkdtemp()
+        try:
+            filename = os.path.join(tmpdir, 'test.xlsx')
+            wb = Workbook()
+            wb.active.title = "Sheet1"
+            wb.active.append(["Amount", 480.25, 12])
+            wb.create_sheet("Sheet2").append([None, 4.8, 48])
+            wb.save(filename)
+
+            test = BP.BenfordsPy()
+            test.analyzeexcel(filename,
+                              "KS",
+                              wkshtincl={"Sheet1", "Sheet2"},
+                              rowlblincldefault=True,
+                              collblincldefault=True,
+                              drilldown=True
+                              )
+
+            records = test.drilldown.records(48)
+            self.assertSequenceEqual(records["sheetname"].tolist(),
+                                     ["Sheet1", "Sheet2", "Sheet2"])
+            self.assertSequenceEqual(records["row"].tolist(), [1, 1, 1])
+            self.assertSequenceEqual(records["col"].tolist(), [2, 2, 3])
+        finally:
+            shutil.rmtree(tmpdir)
+
+    def test_analyzecsv(self):
+        tmpdir = tempfile.mkdtemp()
+        try:
+            filename = os.path.join(tmpdir, 'test.csv')
+            with open(filename, 'w') as fh:
+                fh.write('12,7\n\n# checked\n480.25,3\n\n9,48\n')
+
+            test = BP.BenfordsPy()
+            test.analyzeCSV(filename,
+                            "KS",
+                            rownumincldefault=True,
+                            colnumincldefault=True,
+                            drilldown=True
+                            )
+
+            records = test.drilldown.records(48)
+            self.assertSequenceEqual(records["value"].tolist(), [480.25, 48])
+            self.assertSequenceEqual(records["row"].tolist(), [1, 2])
+            self.assertSequenceEqual(records["col"].tolist(), [0, 1])
+            self.assertSequenceEqual(records["line"].tolist(), [4, 6])
+        finally:
+            shutil.rmtree(tmpdir)
+
+
+if __name__ == '__main__':
+    unittest.main()
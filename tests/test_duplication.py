@@ -0,0 +1,66 @@
+import unittest
+
+import numpy as np
+
+import benfordspy.BenfordsPy as BP
+from benfordspy.duplication import *
+
+
+class TestDuplication(unittest.TestCase):
+
+    def test_duplicates(self):
+        data = [4.99, 10, 4.99, 250, 10, 4.99, 7]
+        self.assertEqual(duplicates(data, k=2), [(4.99, 3), (10.0, 2)])
+
+    def test_repeatrates(self):
+        data = [1, 1, 2, 1, 3, 3, 3]
+        groups = ['a', 'a', 'a', 'b', 'b', 'c', 'c']
+        rates = repeatrates(data, groups)
+        self.assertAlmostEqual(rates['a'], 2 / 3)
+        self.assertAlmostEqual(rates['b'], 0)
+        self.assertAlmostEqual(rates['c'], 1)
+
+    def test_spacesaving(self):
+        rng = np.random.default_rng(0)
+        stream = np.concatenate((np.full(500, 48.0),
+                                 np.full(300, 99.99),
+                                 rng.uniform(0, 1e6, 5000)))
+        rng.shuffle(stream)
+
+        counter = SpaceSaving(capacity=50)
+        for batch in np.array_split(stream, 20):
+            counter.update(batch)
+
+        top = counter.top(2)
+        self.assertEqual([value for value, count, error in top],
+                         [48.0, 99.99])
+        for value, count, error in top:
+            exact = np.count_nonzero(stream == value)
+            self.assertTrue(count - error <= exact <= count)
+        self.assertEqual(counter.N, stream.size)
+
+    def test_spacesavingmerge(self):
+        first = SpaceSaving(capacity=3)
+        second = SpaceSaving(capacity=3)
+        first.update([1, 1, 1, 2, 3])
+        second.update([1, 2, 2, 2, 4])
+        first.merge(second)
+        self.assertEqual(first.N, 10)
+        self.assertEqual(first.top(2)[0][:2], (1, 4))
+        self.assertEqual(first.top(2)[1][:2], (2, 4))
+
+    def test_analyzeduplicates(self):
+        test = BP.BenfordsPy()
+        test.analyzeduplicates([5.5, 7, 5.5, 3], k=1)
+        self.assertEqual(test.duplicates, [(5.5, 2)])
+
+        feed = (batch for batch in [[5.5, 7], np.array([5.5, 3, 7, 7])])
+        test.analyzeduplicates(feed, k=2)
+        self.assertEqual(test.duplicates, [(7.0, 3), (5.5, 2)])
+
+        with self.assertRaises(TypeError):
+            test.analyzeduplicates(np.ones((2, 2)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,178 @@
+import os
+import re
+import shutil
+import tempfile
+import unittest
+import zipfile
+
+import numpy as np
+from openpyxl import Workbook, load_workbook
+
+from benfordspy.excel import (ExcelDB, cellranges, boundingbox, sheetparts,
+                              sheetfingerprints, SheetHistograms)
+from benfordspy.filters import ExcelFilter, Rule
+import benfordspy.numerics as numerics
+
+
+class TestExcelDB(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.filename = os.path.join(self.tmpdir, 'test.xlsx')
+
+        wb = Workbook()
+        ws = wb.active
+        ws.title = "Sheet1"
+        for row in range(1, 21):
+            for col in range(1, 9):
+                ws.cell(row=row, column=col, value=100 * row + col)
+        ws.cell(row=1, column=1, value="Total")
+        wb.save(self.filename)
+
+        self.spec = ExcelFilter(WorkSheets=Rule({"Sheet1"}),
+                                RowLabels=Rule(defaultinclude=True),
+                                ColLabels=Rule(defaultinclude=True))
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_cellranges(self):
+        self.assertEqual(cellranges({"B2:D40"}), [(2, 2, 4, 40)])
+        self.assertEqual(cellranges({(1, 2, 3, 4)}), [(1, 2, 3, 4)])
+        self.assertEqual(cellranges({"F:F"}), [(6, None, 6, None)])
+
+    def test_boundingbox(self):
+        self.assertEqual(boundingbox([(6, None, 6, None)], False, 100, 20),
+                         (1, 100, 6, 6))
+        self.assertEqual(boundingbox([(2, 2, 4, 40)], False, 10, 3),
+                         (2, 10, 2, 3))
+        self.assertEqual(boundingbox([], True, 10, 3), (1, 10, 1, 3))
+        self.assertIsNone(boundingbox([], False, 10, 3))
+        self.assertIsNone(boundingbox([(5, 1, 6, 2)], False, 10, 3))
+        self.assertEqual(boundingbox([], True, None, None),
+                         (1, None, 1, None))
+        self.assertEqual(boundingbox([(6, None, 6, None)], False, None, None),
+                         (1, None, 6, 6))
+        self.assertEqual(boundingbox([(2, 2, 4, 40)], False, None, None),
+                         (2, 40, 2, 4))
+
+    def test_extractall(self):
+        numbers = ExcelDB(self.filename).extractnumbers(self.spec)
+        self.assertEqual(len(numbers), 20 * 8 - 1)
+
+    def test_extractcellrangeoutsidelabels(self):
+        spec = self.spec._replace(CellRange=Rule({"F:F"}),
+                                  RowLabels=Rule({"Total"}))
+        self.assertEqual(ExcelDB(self.filename).extractnumbers(spec), [106])
+
+        # A label to the right of the range.
+        wb = load_workbook(self.filename)
+        wb["Sheet1"].cell(row=3, column=8, value="Total")
+        wb.save(self.filename)
+        self.assertEqual(sorted(ExcelDB(self.filename).extractnumbers(spec)),
+                         [106, 306])
+
+        spec = self.spec._replace(CellRange=Rule({"F5:F8"}),
+                                  ColLabels=Rule({106}))
+        self.assertEqual(sorted(ExcelDB(self.filename).extractnumbers(spec)),
+                         [506, 606, 706, 806])
+
+        spec = spec._replace(ColLabels=Rule({105}))
+        self.assertEqual(ExcelDB(self.filename).extractnumbers(spec), [])
+
+    def test_extractnodimension(self):
+        # Worksheets written without a stored dimension have an unknown size
+        # when read only.
+        nodimension = os.path.join(self.tmpdir, 'nodimension.xlsx')
+        with zipfile.ZipFile(self.filename) as source, \
+                zipfile.ZipFile(nodimension, 'w') as target:
+            for item in source.infolist():
+                content = source.read(item.filename)
+                if item.filename.startswith('xl/worksheets/'):
+                    content = re.sub(rb'<dimension[^>]*/>', b'', content)
+                target.writestr(item, content)
+
+        db = ExcelDB(nodimension)
+        self.assertIsNone(db.wb["Sheet1"].max_row)
+        self.assertEqual(len(db.extractnumbers(self.spec)), 20 * 8 - 1)
+
+        spec = self.spec._replace(CellRange=Rule({"F:F"}))
+        self.assertEqual(sorted(db.extractnumbers(spec)),
+                         [100 * row + 6 for row in range(1, 21)])
+
+    def test_extractcellrange(self):
+        spec = self.spec._replace(CellRange=Rule({"F:F", "B3:C4"},
+                                                 {"F10:F20"}))
+
+        numbers = ExcelDB(self.filename).extractnumbers(spec)
+        expected = ([100 * row + 6 for row in range(1, 10)] +
+                    [302, 303, 402, 403])
+        self.assertEqual(sorted(numbers), sorted(expected))
+
+    def test_extractcellrangelabels(self):
+        spec = self.spec._replace(CellRange=Rule({"A1:C5"}),
+                                  RowLabels=Rule(exclude={"Total"},
+                                                 defaultinclude=True))
+
+        numbers = ExcelDB(self.filename).extractnumbers(spec)
+        expected = [100 * row + col for row in range(2, 6)
+                    for col in range(1, 4)]
+        self.assertEqual(sorted(numbers), sorted(expected))
+
+
+class TestSheetHistograms(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.filename = os.path.join(self.tmpdir, 'test.xlsx')
+
+        wb = Workbook()
+        wb.active.title = "Jan"
+        for name in ["Jan", "Feb", "Mar"]:
+            ws = wb[name] if name in wb.sheetnames else wb.create_sheet(name)
+            for row in range(1, 30):
+                ws.append([row, 7 * row])
+        wb.save(self.filename)
+
+        self.spec = ExcelFilter(WorkSheets=Rule({"Jan", "Feb", "Mar"}),
+                                RowLabels=Rule(defaultinclude=True),
+                                ColLabels=Rule(defaultinclude=True))
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_sheetparts(self):
+        self.assertEqual(sheetparts(self.filename),
+                         {"Jan": "xl/worksheets/sheet1.xml",
+                          "Feb": "xl/worksheets/sheet2.xml",
+                          "Mar": "xl/worksheets/sheet3.xml"})
+
+    def test_incremental(self):
+        store = SheetHistograms()
+        counts = store.counts(self.filename, self.spec)
+        self.assertEqual(sorted(store.extracted), ["Feb", "Jan", "Mar"])
+
+        before = sheetfingerprints(self.filename)
+        wb = load_workbook(self.filename)
+        wb["Feb"]["A1"] = 9000
+        wb.save(self.filename)
+        after = sheetfingerprints(self.filename)
+        self.assertEqual(before["Jan"], after["Jan"])
+        self.assertNotEqual(before["Feb"], after["Feb"])
+
+        updated = store.counts(self.filename, self.spec)
+        self.assertEqual(store.extracted, ["Feb"])
+        self.assertEqual(updated[9] - counts[9], 1)
+        self.assertEqual(counts[1] - updated[1], 1)
+
+        data = ExcelDB(self.filename).extractnumbers(self.spec)
+        firstdigits = [numerics.digitn(1, value) for value in data]
+        expected = numerics.digitcounts(np.array(firstdigits, dtype=int))
+        self.assertSequenceEqual(updated.tolist(), expected.tolist())
+
+        store.counts(self.filename, self.spec)
+        self.assertEqual(store.extracted, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+import os
+import shutil
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from openpyxl import Workbook
+
+import benfordspy.BenfordsPy as BP
+from benfordspy.excel import ExcelDB
+from benfordspy.filters import *
+
+
+class TestFilters(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.filename = os.path.join(self.tmpdir, 'test.xlsx')
+
+        wb = Workbook()
+        ws = wb.active
+        ws.title = "Sheet1"
+        ws.append(["Label", "Cost", "Price"])
+        for row in range(1, 200):
+            ws.append(["Item", 10 * row + 1, 70 + row])
+        wb.save(self.filename)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_rule(self):
+        rule = Rule({"a"}, ["b"], 1)
+        self.assertEqual(rule, Rule(frozenset({"a"}), {"b"}, True))
+        self.assertEqual(hash(rule), hash(Rule({"a"}, {"b"}, True)))
+        with self.assertRaises(AttributeError):
+            rule.include = {"c"}
+
+    def test_fromclass(self):
+        class Filter:
+            class RowLabels:
+                include = {"Assets"}
+                exclude = set()
+                defaultinclude = True
+
+        spec = ExcelFilter.fromclass(Filter)
+        self.assertEqual(spec.RowLabels, Rule({"Assets"}, None, True))
+        self.assertEqual(spec.CellRange, Rule())
+        self.assertEqual(CSVFilter.fromclass(Filter).RowNumbers, Rule())
+
+    def test_extractspec(self):
+        spec = ExcelFilter(WorkSheets=Rule({"Sheet1"}),
+                           RowLabels=Rule(defaultinclude=True),
+                           ColLabels=Rule({"Price"}))
+        numbers = ExcelDB(self.filename).extractnumbers(spec)
+        self.assertEqual(sorted(numbers), list(range(71, 270)))
+        self.assertEqual(ExcelDB.Filter.ColLabels.include, set())
+
+    def test_concurrent(self):
+        columns = ["Cost", "Price"] * 4
+
+        def analyze(column, cache=None):
+            test = BP.BenfordsPy(cache)
+            test.analyzeexcel(self.filename,
+                              "KS",
+                              wkshtincl={"Sheet1"},
+                              rowlblincldefault=True,
+                              collblincl={column}
+                              )
+            return test.result
+
+        serial = [analyze(column) for column in columns]
+        self.assertNotEqual(serial[0], serial[1])
+
+        # Without a cache every call extracts the numbers, concurrently.
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            threaded = list(executor.map(analyze, columns))
+        self.assertEqual(threaded, serial)
+
+        cache = {}
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            threaded = list(executor.map(analyze, columns, [cache] * 8))
+        self.assertEqual(threaded, serial)
+        self.assertEqual(len(cache), 2)
+
+if __name__ == '__main__':
+    unittest.main()
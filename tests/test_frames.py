@@ -0,0 +1,125 @@
+import unittest
+
+import numpy as np
+
+import benfordspy.BenfordsPy as BP
+import benfordspy.numerics as numerics
+from benfordspy.frames import *
+
+try:
+    import pandas as pd
+except ImportError:
+    pd = None
+
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+
+@unittest.skipIf(pd is None, "pandas is not installed")
+class TestPandas(unittest.TestCase):
+
+    def setUp(self):
+        self.frame = pd.DataFrame({
+            "vendor": ["a", "b", "a", "b", None, "a"],
+            "amount": [12.5, np.nan, 300, 45, 9, 0],
+            "count": pd.array([1, None, 3, 4, 5, 16], dtype="Int64")
+        })
+
+    def test_zerocopy(self):
+        values, valid = next(chunks(self.frame["amount"]))
+        self.assertTrue(np.shares_memory(values,
+                                         self.frame["amount"].to_numpy()))
+        self.assertIsNone(valid)
+
+        values, valid = next(chunks(self.frame["count"]))
+        self.assertTrue(np.shares_memory(values,
+                                         self.frame["count"].array._data))
+        self.assertSequenceEqual(valid.tolist(),
+                                 [True, False, True, True, True, True])
+
+    def test_framecounts(self):
+        self.assertSequenceEqual(
+            framecounts(self.frame, "amount").tolist(),
+            [0, 1, 0, 1, 1, 0, 0, 0, 0, 1])
+        self.assertSequenceEqual(
+            framecounts(self.frame["count"]).tolist(),
+            [0, 2, 0, 1, 1, 1, 0, 0, 0, 0])
+
+        counts, keys = framecounts(self.frame, "amount", "vendor")
+        self.assertEqual(keys, ["a", "b", None])
+        self.assertSequenceEqual(counts.tolist(),
+                                 [[0, 1, 0, 1, 0, 0, 0, 0, 0, 0],
+                                  [0, 0, 0, 0, 1, 0, 0, 0, 0, 0],
+                                  [0, 0, 0, 0, 0, 0, 0, 0, 0, 1]])
+
+    def test_analyzeframe(self):
+        test = BP.BenfordsPy()
+        test.analyzeframe(self.frame, "d", "amount", groupby="vendor")
+        self.assertEqual(set(test.result.groupkeys()), {"a", "b", None})
+        self.assertAlmostEqual(
+            test.result.get("a").d,
+            numerics.statistic("d", np.array([0, 1, 0, 1, 0, 0, 0, 0, 0, 0])))
+
+        test.analyzeframe(self.frame["amount"], "KS")
+        self.assertAlmostEqual(
+            test.result,
+            numerics.test("KS", np.array([1, 3, 4, 9])))
+
+        test.analyzeframe(self.frame[["amount"]], "KS")
+        self.assertAlmostEqual(
+            test.result,
+            numerics.test("KS", np.array([1, 3, 4, 9])))
+
+        with self.assertRaises(ValueError):
+            test.analyzeframe(self.frame, "KS")
+
+    def test_zeros(self):
+        test = BP.BenfordsPy()
+        test.analyzeframe(pd.Series([1.5, 0, 0, 23]), "KS")
+
+        listtest = BP.BenfordsPy()
+        listtest.analyzelist([1.5, 0, 0, 23], "KS")
+        self.assertAlmostEqual(test.result, listtest.result)
+
+
+@unittest.skipIf(pa is None, "pyarrow is not installed")
+class TestArrow(unittest.TestCase):
+
+    def setUp(self):
+        self.table = pa.table({
+            "vendor": pa.chunked_array([["a", "b"], ["a", "b", "a"]]),
+            "amount": pa.chunked_array([[12.5, None], [300.0, 45.0, 9.0]])
+        })
+
+    def test_zerocopy(self):
+        column = self.table.column("amount")
+        values, valid = list(chunks(column))[1]
+        self.assertEqual(values.ctypes.data,
+                         column.chunk(1).buffers()[1].address)
+        self.assertIsNone(valid)
+
+        values, valid = list(chunks(column.slice(1)))[0]
+        self.assertSequenceEqual(valid.tolist(), [False])
+
+    def test_framecounts(self):
+        self.assertSequenceEqual(
+            framecounts(self.table, "amount").tolist(),
+            [0, 1, 0, 1, 1, 0, 0, 0, 0, 1])
+
+        self.assertSequenceEqual(
+            framecounts(self.table.select(["amount"])).tolist(),
+            [0, 1, 0, 1, 1, 0, 0, 0, 0, 1])
+        with self.assertRaises(ValueError):
+            framecounts(self.table)
+
+        counts, keys = framecounts(self.table, "amount", ["vendor"])
+        self.assertEqual(keys, ["a", "b"])
+        self.assertSequenceEqual(counts.tolist(),
+                                 [[0, 1, 0, 1, 0, 0, 0, 0, 0, 1],
+                                  [0, 0, 0, 0, 1, 0, 0, 0, 0, 0]])
+
+
+if __name__ == '__main__':
+    unittest.main()
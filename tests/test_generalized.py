@@ -0,0 +1,99 @@
+import unittest
+
+import numpy as np
+
+import benfordspy.numerics as numerics
+from benfordspy.generalized import *
+
+
+class TestGeneralized(unittest.TestCase):
+
+    def test_firstdigits(self):
+        data = np.array([0, 1, 7, 8, 9, 63, 64, 511, 512, 0.125, -20])
+        self.assertEqual(firstdigits(data, 8).tolist(),
+                         [0, 1, 7, 1, 1, 7, 1, 7, 1, 1, 2])
+        self.assertEqual(firstdigits([2 ** k for k in range(40)], 2).tolist(),
+                         [1] * 40)
+        self.assertEqual(firstdigits(data, 10).tolist(),
+                         numerics.leadingdigits(data, 1).tolist())
+
+        self.assertEqual(firstdigits([98, 1458], 7).tolist()[0], 2)
+        self.assertEqual(firstdigits([1458], 3).tolist(), [2])
+        for base in [3, 5, 6, 7, 12]:
+            for digit in range(1, base):
+                numbers = [digit * base ** k for k in range(20)]
+                self.assertEqual(firstdigits(numbers, base).tolist(),
+                                 [digit] * 20)
+                self.assertEqual(
+                    firstdigits([(digit + 1) * base ** 5 - 1], base).tolist(),
+                    [digit])
+
+        counts = digitcounts(data, 8)
+        self.assertEqual(counts.tolist(), [0, 6, 1, 0, 0, 0, 0, 3])
+
+    def test_expected(self):
+        for base in [2, 8, 10, 16]:
+            self.assertAlmostEqual(benfordpdf(base).sum(), 1)
+            for alpha in [-2.0, 0.0, 0.5, 1.0, 1 + 1e-10, 2.5]:
+                pdf = generalizedpdf(alpha, base)
+                self.assertEqual(pdf.shape, (base - 1,))
+                self.assertAlmostEqual(pdf.sum(), 1)
+
+            np.testing.assert_allclose(generalizedpdf(1.0, base),
+                                       benfordpdf(base))
+            np.testing.assert_allclose(generalizedpdf(1 + 1e-6, base),
+                                       benfordpdf(base), rtol=1e-5)
+            np.testing.assert_allclose(generalizedpdf(0.0, base),
+                                       np.full(base - 1, 1 / (base - 1)))
+
+        benfpdf = numerics.benfords().pdf
+        np.testing.assert_allclose(benfordpdf(10),
+                                   [benfpdf[k] for k in range(1, 10)])
+
+        self.assertIs(generalizedpdf(0.5, 10), generalizedpdf(0.5, 10))
+        self.assertFalse(benfordpdf(10).flags.writeable)
+
+    def test_fit(self):
+        for alpha in [-1.0, 0.3, 1.0, 2.2]:
+            counts = np.zeros(10)
+            counts[1:] = 1e6 * generalizedpdf(alpha, 10)
+            self.assertAlmostEqual(fit(counts), alpha, places=4)
+
+        counts = np.zeros((3, 8))
+        for idx, alpha in enumerate([0.0, 0.8, 1.5]):
+            counts[idx, 1:] = 1e6 * generalizedpdf(alpha, 8)
+        np.testing.assert_allclose(fit(counts, 8), [0.0, 0.8, 1.5],
+                                   atol=1e-4)
+
+        # Pareto distributed data fit the power law exponent of its density.
+        rng = np.random.default_rng(0)
+        data = rng.pareto(0.5, 100000) + 1
+        self.assertAlmostEqual(fit(digitcounts(data)), 1.5, delta=0.05)
+
+    def test_screen(self):
+        counts = np.array([[0, 301, 176, 125, 97, 79, 67, 58, 51, 46],
+                           [0, 100, 100, 100, 100, 100, 100, 100, 100, 100]])
+
+        screened = screen(counts, {"Benford": benfordpdf(10),
+                                   "uniform": generalizedpdf(0.0, 10),
+                                   "fitted": "fit"})
+
+        for testtype in ["Kuiper", "KS", "m", "d"]:
+            np.testing.assert_allclose(screened["Benford"][testtype],
+                                       numerics.statistic(testtype, counts))
+            self.assertEqual(screened["uniform"][testtype].shape, (2,))
+
+        self.assertAlmostEqual(screened["uniform"]["d"][1], 0)
+        np.testing.assert_allclose(screened["fitted"]["alpha"], [1, 0],
+                                   atol=0.01)
+
+        single = screen(counts[0], {"Benford": benfordpdf(10)})
+        self.assertAlmostEqual(float(single["Benford"]["KS"]),
+                               float(numerics.statistic("KS", counts[0])))
+
+        with self.assertRaises(ValueError):
+            screen(counts, {"other": "unknown"})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,33 @@
+import subprocess
+import sys
+import unittest
+
+
+class TestImports(unittest.TestCase):
+
+    def test_listonly(self):
+        script = ("import sys\n"
+                  "import numpy\n"
+                  "before = set(sys.modules)\n"
+                  "import benfordspy.BenfordsPy as BP\n"
+                  "BP.BenfordsPy().analyzelist([1, 2, 3, 45], 'KS')\n"
+                  "loaded = set(sys.modules) - before\n"
+                  "print(' '.join(sorted({name.split('.')[0]\n"
+                  "                       for name in loaded})))\n")
+        output = subprocess.run([sys.executable, "-c", script],
+                                capture_output=True,
+                                text=True,
+                                check=True
+                                ).stdout
+        self.assertEqual(output.split(), ["benfordspy"])
+
+    def test_lazyattributes(self):
+        import benfordspy.BenfordsPy as BP
+        from benfordspy.excel import ExcelDB
+        from benfordspy.csv import CSVDB
+        self.assertIs(BP.ExcelDB, ExcelDB)
+        self.assertIs(BP.CSVDB, CSVDB)
+
+
+if __name__ == '__main__':
+    unittest.main()
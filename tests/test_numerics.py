@@ -15,6 +15,23 @@ class TestNumerics(unittest.TestCase):
         self.assertEqual(digitn(1, 0.23), 2)
         self.assertEqual(digitn(2, 0.23), 3)
 
+    def test_leadingdigits(self):
+        data = np.array([38492, 0.0471, 0.3, 1e15 + 1, -999.99, 1000, 0])
+        self.assertSequenceEqual(leadingdigits(data, 2).tolist(),
+                                 [38, 47, 30, 10, 99, 10, 0])
+        self.assertSequenceEqual(leadingdigits(data).tolist(),
+                                 [3, 4, 3, 1, 9, 1, 0])
+
+        # Decimals stored just below their value, e.g. 0.29 as 0.2899...
+        self.assertSequenceEqual(
+            leadingdigits([0.29, 0.57, 0.58, 0.0029], 2).tolist(),
+            [29, 57, 58, 29])
+        self.assertEqual(int(leadingdigits(999.9999999999999, 1)), 1)
+        self.assertSequenceEqual(
+            leadingdigits(np.arange(1, 100000), 2).tolist(),
+            [int(str(k)[:2]) if k >= 10 else 10 * k
+             for k in range(1, 100000)])
+
     def test_magnitudein(self):
         array = np.array([1, 123, 234, 12345])
         self.assertEqual(magnitudebin(array), {0: 1, 1: 0, 2: 2, 3: 0, 4: 1})
@@ -33,5 +50,25 @@ class TestNumerics(unittest.TestCase):
         self.assertAlmostEqual(kuipertest(testfirstdigits, plot=False),
                                0.21, places=2)
 
+    def test_statistic(self):
+        counts = np.array([0, 3, 6, 4, 4, 3, 4, 3, 2, 1])
+        stacked = np.stack((counts, 2 * counts))
+        for testtype in ["Kuiper", "KS", "m", "d"]:
+            values = statistic(testtype, stacked)
+            self.assertEqual(values.shape, (2,))
+            self.assertAlmostEqual(values[0], statistic(testtype, counts))
+        self.assertAlmostEqual(statistic("Kuiper", counts), 0.21, places=2)
+
+    def test_bootstrap(self):
+        counts = np.array([0, 301, 176, 125, 97, 79, 67, 58, 51, 46])
+        intervals = bootstrap(counts, replicates=2000, seed=1, batchsize=300)
+        self.assertEqual(intervals,
+                         bootstrap(counts, replicates=2000, seed=1,
+                                   batchsize=300, processes=2))
+        for testtype, (lower, upper) in intervals.items():
+            self.assertLessEqual(lower, upper)
+            self.assertLess(upper, 1.5)
+
+
 if __name__ == '__main__':
     unittest.main(exit=False)
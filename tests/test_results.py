@@ -0,0 +1,83 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+import benfordspy.numerics as numerics
+from benfordspy.results import *
+
+
+class TestResults(unittest.TestCase):
+
+    def setUp(self):
+        self.counts = np.array([[0, 301, 176, 125, 97, 79, 67, 58, 51, 46],
+                                [0, 100, 100, 100, 100, 100, 100, 100, 100,
+                                 100],
+                                [0, 3, 6, 4, 4, 3, 4, 3, 2, 1]])
+        self.table = ResultTable.fromcounts(self.counts, ["x", "y", "z"])
+
+    def test_fromcounts(self):
+        self.assertEqual(self.table.records.dtype, RESULTDTYPE)
+        for idx, counts in enumerate(self.counts):
+            result = self.table[idx]
+            self.assertEqual(result.N, counts.sum())
+            for testtype, testvar in zip(TESTS, TESTVARS):
+                testvalue = numerics.statistic(testtype, counts)
+                self.assertAlmostEqual(getattr(result, testvar), testvalue)
+                for alpha, significant in numerics.testsig(
+                        testtype, testvalue).items():
+                    self.assertEqual(result.significant(testtype, alpha),
+                                     significant)
+
+    def test_filterrank(self):
+        significant = self.table.filter(self.table.significant("d", 0.01))
+        self.assertSequenceEqual(significant.groupkeys().tolist(), ["y"])
+
+        empty = ResultTable.fromcounts(
+            np.vstack((self.counts, np.zeros(10, dtype=int))),
+            ["x", "y", "z", "empty"])
+        for descending in [True, False]:
+            ranked = empty.rank("d", descending=descending)
+            self.assertEqual(ranked.groupkeys().tolist()[-1], "empty")
+        self.assertNotIn("empty", empty.rank("d", k=2).groupkeys().tolist())
+
+        ranked = self.table.rank("N", k=2)
+        self.assertSequenceEqual(ranked.groupkeys().tolist(), ["x", "y"])
+        self.assertEqual(self.table.get("z").N, 30)
+        self.assertIsNone(self.table.get("w"))
+
+    def test_saveload(self):
+        tmpdir = tempfile.mkdtemp()
+        try:
+            filename = os.path.join(tmpdir, 'results.npz')
+            table = ResultTable.fromcounts(self.counts,
+                                           [("a", 1), ("a", 2), None])
+            table.save(filename)
+            loaded = ResultTable.load(filename)
+            self.assertEqual(loaded.records.tobytes(),
+                             table.records.tobytes())
+            self.assertEqual(loaded.get(("a", 2)).N, 900)
+        finally:
+            shutil.rmtree(tmpdir)
+
+    def test_merge(self):
+        merged = ResultTable.merge([self.table,
+                                    ResultTable.fromcounts(self.counts[:1])])
+        self.assertEqual(len(merged), 4)
+        self.assertSequenceEqual(merged.groupkeys().tolist(),
+                                 ["x", "y", "z", 0])
+        self.assertEqual(merged[3].V, merged[0].V)
+        self.assertEqual(merged.get(0).N, 1000)
+        self.assertIsNone(merged.get("0"))
+
+        merged = ResultTable.merge([
+            ResultTable.fromcounts(self.counts[:1], [7]),
+            ResultTable.fromcounts(self.counts[1:2], ["x"])])
+        self.assertEqual(merged.get(7).N, 1000)
+        self.assertEqual(merged.get("x").N, 900)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,105 @@
+import asyncio
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+import benfordspy.numerics as numerics
+from benfordspy.service import BenfordsService, request, specfrom
+from benfordspy.filters import ExcelFilter, Rule
+
+
+class TestService(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.service = BenfordsService(processes=2, cachesize=2)
+        await self.service.start()
+
+    async def asyncTearDown(self):
+        await self.service.close()
+        shutil.rmtree(self.tmpdir)
+
+    def test_specfrom(self):
+        spec = specfrom("excel", {"WorkSheets": {"include": ["Sheet1"]},
+                                  "CellRange": {"include": [[1, 1, 2, 9]]}})
+        self.assertEqual(spec, ExcelFilter(WorkSheets=Rule({"Sheet1"}),
+                                           CellRange=Rule({(1, 1, 2, 9)},
+                                                          None, True)))
+
+    async def test_values(self):
+        values = [1, 1, 1, 2, 2, 3, 4, 5, 7, 9, 12, 150, 1800]
+        response = await request({"id": 7, "testtype": "KS",
+                                  "values": values},
+                                 port=self.service.port)
+
+        firstdigits = np.array([numerics.digitn(1, value)
+                                for value in values], dtype=int)
+        self.assertEqual(response["id"], 7)
+        self.assertAlmostEqual(response["testvalue"],
+                               numerics.test("KS", firstdigits))
+        self.assertEqual(set(response["significance"]),
+                         {"0.1", "0.05", "0.01"})
+
+        await request({"testtype": "d", "values": values},
+                      port=self.service.port)
+        self.assertEqual((self.service.hits, self.service.misses), (1, 1))
+
+    async def test_file(self):
+        filename = os.path.join(self.tmpdir, 'test.csv')
+        with open(filename, 'w') as fh:
+            fh.write("12,3.5\n450,0.07\n")
+
+        response = await request({"testtype": "m", "file": filename,
+                                  "source": "text"},
+                                 port=self.service.port)
+        counts = np.array([0, 1, 0, 1, 1, 0, 0, 1, 0, 0])
+        self.assertAlmostEqual(response["testvalue"],
+                               numerics.statistic("m", counts))
+
+    async def test_cache(self):
+        for values in [[1, 2], [3, 4], [5, 6], [1, 2]]:
+            await self.service.score({"values": values})
+        self.assertEqual(len(self.service.cache), 2)
+        self.assertEqual(self.service.misses, 4)
+
+    async def test_largebatch(self):
+        rng = np.random.default_rng(0)
+        values = np.round(np.exp(rng.uniform(0, 10, 20000)), 2).tolist()
+        response = await request({"id": 3, "testtype": "KS",
+                                  "values": values},
+                                 port=self.service.port)
+        self.assertEqual(response["id"], 3)
+        self.assertIn("testvalue", response)
+
+    async def test_linelimit(self):
+        service = BenfordsService(processes=1, linelimit=1000)
+        await service.start()
+        try:
+            reader, writer = await asyncio.open_connection(
+                '127.0.0.1', service.port)
+            for values in [list(range(1, 2000)), [12, 3, 450]]:
+                writer.write(json.dumps({"values": values}).encode() + b'\n')
+            await writer.drain()
+
+            response = json.loads(await reader.readline())
+            self.assertIsNone(response["id"])
+            self.assertIn("longer than 1000 bytes", response["error"])
+
+            response = json.loads(await reader.readline())
+            self.assertIn("testvalue", response)
+            writer.close()
+        finally:
+            await service.close()
+
+    async def test_error(self):
+        response = await self.service.score({"id": 1, "source": "xml",
+                                             "file": __file__})
+        self.assertIn("Unknown source", response["error"])
+
+
+if __name__ == '__main__':
+    unittest.main()
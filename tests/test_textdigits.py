@@ -0,0 +1,65 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from benfordspy.textdigits import *
+
+
+class TestTextDigits(unittest.TestCase):
+
+    def test_tokendigits(self):
+        self.assertEqual(tokendigits(b'0', b'3', b''), (3, 0, -1))
+        self.assertEqual(tokendigits(b'1000000000000001', b'', b''),
+                         (1, 0, 1))
+        self.assertEqual(tokendigits(b'34823', b'', b''), (3, 4, 23))
+        self.assertEqual(tokendigits(b'1,234', b'50', b'', b','), (1, 2, 50))
+        self.assertEqual(tokendigits(b'6', b'02', b'23'), (6, 0, 0))
+        self.assertEqual(tokendigits(b'', b'0048', b'-2'), (4, 8, 48))
+        self.assertEqual(tokendigits(b'00', b'0', b''), (0, 0, -1))
+        self.assertEqual(tokendigits(b'1', b'', b'999999999'), (1, 0, 0))
+        self.assertEqual(tokendigits(b'1', b'', b'-999999999'), (1, 0, 1))
+        self.assertEqual(tokendigits(b'25', b'', b'1'), (2, 5, 50))
+        self.assertEqual(tokendigits(b'7', b'', b'9' * 5000), (7, 0, 0))
+
+    def test_scandigits(self):
+        buffer = (b'id,amount,note\n'
+                  b'1,0.3,Q3\n'
+                  b'2,-48.25,2020-01-05\n'
+                  b'3,+7.1e+2,"v1.2.3"\n'
+                  b'{"a": .5, "b": [9E-1]}\n')
+        first, second, lasttwo = scandigits(buffer)
+        self.assertSequenceEqual(first.tolist(), [1, 3, 2, 4, 3, 7, 5, 9])
+        self.assertSequenceEqual(second.tolist(), [0, 0, 0, 8, 0, 1, 0, 0])
+        self.assertSequenceEqual(lasttwo.tolist(),
+                                 [-1, -1, -1, 25, -1, 10, -1, -1])
+
+    def test_scandigitsdates(self):
+        buffer = b'01/05/2020,12:30,7:05:59,{"a":5,"b":61},3/4\n'
+        first = scandigits(buffer)[0]
+        self.assertSequenceEqual(first.tolist(), [5, 6])
+
+    def test_scandigitsthousands(self):
+        first, second, lasttwo = scandigits(b'"1,234.56";"987,654"', b',')
+        self.assertSequenceEqual(first.tolist(), [1, 9])
+        self.assertSequenceEqual(second.tolist(), [2, 8])
+        self.assertSequenceEqual(lasttwo.tolist(), [56, 54])
+
+    def test_scanfile(self):
+        tmpdir = tempfile.mkdtemp()
+        try:
+            filename = os.path.join(tmpdir, 'test.csv')
+            with open(filename, 'w') as fh:
+                for k in range(1, 1000):
+                    fh.write('{},{}.5\n'.format(k, k * 3))
+
+            first = scanfile(filename, blocksize=64)[0]
+            expected = scandigits(open(filename, 'rb').read())[0]
+            self.assertSequenceEqual(first.tolist(), expected.tolist())
+            self.assertEqual(first.size, 2 * 999)
+        finally:
+            shutil.rmtree(tmpdir)
+
+
+if __name__ == '__main__':
+    unittest.main()